@@ -0,0 +1,75 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Text
+
+from rasa_sdk import Tracker
+from rasa_sdk.executor import CollectingDispatcher
+
+from . import metrics, responses, settings
+
+# asyncio and concurrent.futures are only needed once an action is offloaded, so they are not imported up front.
+if TYPE_CHECKING:
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+_executor: Optional["ThreadPoolExecutor"] = None
+_pending_slots: Optional["asyncio.Semaphore"] = None
+
+
+def get_executor() -> "ThreadPoolExecutor":
+    global _executor
+    if _executor is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _executor = ThreadPoolExecutor(max_workers=settings.EXECUTOR_WORKERS, thread_name_prefix="action")
+    return _executor
+
+
+def get_pending_slots() -> "asyncio.Semaphore":
+    global _pending_slots
+    if _pending_slots is None:
+        import asyncio
+        _pending_slots = asyncio.Semaphore(settings.EXECUTOR_MAX_PENDING)
+    return _pending_slots
+
+
+class SyncActionBase:
+    offload = True
+
+    def handle(self, dispatcher: CollectingDispatcher, tracker: Tracker,
+               domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+        raise NotImplementedError("Action must implement handle")
+
+    def count_branch(self, branch: Text) -> None:
+        if metrics.ENABLED:
+            metrics.REGISTRY.count_branch(self.name(), branch)
+
+    def handle_with_metrics(self, dispatcher: CollectingDispatcher, tracker: Tracker,
+                            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+        if not metrics.ENABLED:
+            return self.handle_with_responses(dispatcher, tracker, domain)
+        return metrics.instrumented_call(self, self.handle_with_responses, dispatcher, tracker, domain)
+
+    def handle_with_responses(self, dispatcher: CollectingDispatcher, tracker: Tracker,
+                              domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+        batch = responses.batch_for(dispatcher, tracker.get_latest_input_channel(), domain)
+        if batch is None:
+            return self.handle(dispatcher, tracker, domain)
+        events = self.handle(batch, tracker, domain)
+        batch.flush()
+        return events
+
+    def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+        return self.handle_with_metrics(dispatcher, tracker, domain)
+
+
+class AsyncActionBase(SyncActionBase):
+    async def run(self, dispatcher: CollectingDispatcher, tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+        if not self.offload:
+            return self.handle_with_metrics(dispatcher, tracker, domain)
+
+        async with get_pending_slots():
+            import asyncio
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(get_executor(), self.handle_with_metrics, dispatcher, tracker, domain)
+
+
+ActionBase = AsyncActionBase if settings.ASYNC_ACTIONS else SyncActionBase
@@ -0,0 +1,189 @@
+import json
+import logging
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Dict, NamedTuple, Optional, Sequence, Text, Tuple
+
+from .menu import MenuCatalog
+from .opening_hours import OpeningHoursIndex
+from .pricing import PricingEngine
+from .snapshot_file import MappedMenuCatalog, SnapshotFile
+
+logger = logging.getLogger(__name__)
+
+# What reading a data file can raise: OSError and ValueError for missing files and invalid JSON, KeyError and
+# TypeError for malformed documents, e.g. a menu item without a "price".
+DATA_FILE_ERRORS = (OSError, ValueError, KeyError, TypeError)
+
+
+def read_json_file(file_path):
+    with open(file_path, "r") as file:
+        return json.load(file)
+
+
+def load_json_file(file_path):
+    return read_json_file(file_path).get('items', [])
+
+
+def merge_menu_items(base_items, menu_document):
+    # A location menu replaces base items with the same id, appends new ones and drops the "unavailable" ids.
+    overrides = {item["id"]: item for item in menu_document.get('items', [])}
+    unavailable = set(menu_document.get('unavailable', []))
+    merged = [overrides.pop(item.get("id"), item) for item in base_items if item.get("id") not in unavailable]
+    merged.extend(overrides.values())
+    return merged
+
+
+class DataSnapshot(NamedTuple):
+    version: int
+    opening_hours: Dict[Text, Any]
+    opening_hours_index: OpeningHoursIndex
+    menu_items: Sequence[Dict[Text, Any]]
+    menu_catalog: MenuCatalog
+    pricing: PricingEngine
+
+
+def file_signature(file_path: Optional[Text]) -> Optional[Tuple[int, int, int]]:
+    if file_path is None:
+        return None
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_ino, stat.st_size
+
+
+# With a base store, a missing path means "use the base data as is": the base snapshot's hours and menu objects are
+# shared rather than copied, and a menu file only holds the location's changes to the base menu.
+class DataStore:
+    def __init__(self, opening_hours_path: Optional[Text], menu_path: Optional[Text], poll_interval: float = 2.0,
+                 base: Optional["DataStore"] = None, snapshot_path: Optional[Text] = None,
+                 pricing_path: Optional[Text] = None):
+        if base is None and snapshot_path is None and (opening_hours_path is None or menu_path is None):
+            raise ValueError("DataStore needs both data files unless it has a base store")
+        self.opening_hours_path = opening_hours_path
+        self.menu_path = menu_path
+        self.poll_interval = poll_interval
+        self.base = base
+        self.snapshot_path = snapshot_path
+        self.pricing_path = pricing_path
+
+        self.reload_count = 0
+        self.failed_reload_count = 0
+        self.last_reload_latency: Optional[float] = None
+
+        self._reload_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+        self._signatures = self._current_signatures()
+        self._failed_signatures = None
+        self._snapshot = self._build_snapshot(version=1)
+
+    def snapshot(self) -> DataSnapshot:
+        return self._snapshot
+
+    def _current_signatures(self):
+        base_version = self.base.snapshot().version if self.base is not None else None
+        return (file_signature(self.opening_hours_path), file_signature(self.menu_path),
+                file_signature(self.snapshot_path), file_signature(self.pricing_path), base_version)
+
+    def _build_snapshot(self, version: int) -> DataSnapshot:
+        if self.snapshot_path is not None:
+            return self._build_compiled_snapshot(version)
+
+        base_snapshot = self.base.snapshot() if self.base is not None else None
+
+        if self.opening_hours_path is None:
+            opening_hours, opening_hours_index = base_snapshot.opening_hours, base_snapshot.opening_hours_index
+        else:
+            hours_document = read_json_file(self.opening_hours_path)
+            opening_hours = MappingProxyType(hours_document.get('items', {}))
+            opening_hours_index = OpeningHoursIndex(opening_hours, hours_document.get('holidays'))
+
+        if self.menu_path is None:
+            menu_items, menu_catalog = base_snapshot.menu_items, base_snapshot.menu_catalog
+        else:
+            if base_snapshot is None:
+                menu_items = tuple(load_json_file(self.menu_path))
+            else:
+                menu_items = tuple(merge_menu_items(base_snapshot.menu_items, read_json_file(self.menu_path)))
+            menu_catalog = MenuCatalog(menu_items)
+            menu_catalog.render()
+        pricing = self._build_pricing(menu_catalog, base_snapshot)
+        return DataSnapshot(version, opening_hours, opening_hours_index, menu_items, menu_catalog, pricing)
+
+    def _build_compiled_snapshot(self, version: int) -> DataSnapshot:
+        # Menu items stay in the mapped file and are read through views; the menu is not pre-rendered either.
+        snapshot_file = SnapshotFile(self.snapshot_path)
+        hours_document = snapshot_file.opening_hours_document()
+        opening_hours = MappingProxyType(hours_document.get('items', {}))
+        opening_hours_index = OpeningHoursIndex(opening_hours, hours_document.get('holidays'))
+        menu_catalog = MappedMenuCatalog(snapshot_file)
+        pricing = self._build_pricing(menu_catalog, None)
+        return DataSnapshot(version, opening_hours, opening_hours_index, snapshot_file.items, menu_catalog, pricing)
+
+    def _build_pricing(self, menu_catalog: MenuCatalog, base_snapshot: Optional[DataSnapshot]) -> PricingEngine:
+        # The pricing file is optional; without one the base rules (or none) apply to this store's menu.
+        if self.pricing_path is not None and os.path.exists(self.pricing_path):
+            return PricingEngine(menu_catalog, read_json_file(self.pricing_path))
+        if base_snapshot is None:
+            return PricingEngine(menu_catalog)
+        if menu_catalog is base_snapshot.menu_catalog:
+            return base_snapshot.pricing
+        return PricingEngine(menu_catalog, base_snapshot.pricing.rules)
+
+    def check_for_changes(self) -> bool:
+        signatures = self._current_signatures()
+        if signatures == self._signatures or signatures == self._failed_signatures:
+            return False
+        return self.reload()
+
+    def reload(self) -> bool:
+        with self._reload_lock:
+            signatures = self._current_signatures()
+            started = time.perf_counter()
+            try:
+                snapshot = self._build_snapshot(version=self._snapshot.version + 1)
+            except DATA_FILE_ERRORS as error:
+                self.failed_reload_count += 1
+                self._failed_signatures = signatures
+                logger.warning("Keeping data snapshot %d, reload failed: %s", self._snapshot.version, error)
+                return False
+
+            self._snapshot = snapshot
+            self._signatures = signatures
+            self.reload_count += 1
+            self.last_reload_latency = time.perf_counter() - started
+            logger.info("Loaded data snapshot %d in %.2f ms", snapshot.version, self.last_reload_latency * 1000)
+            return True
+
+    def start_watching(self) -> None:
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop_event.clear()
+        self._watcher = threading.Thread(target=self._watch, name="data-store-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        self._stop_event.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _watch(self) -> None:
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                self.check_for_changes()
+            except Exception:
+                logger.exception("Data store watcher failed to check for changes")
+
+    def stats(self) -> Dict[Text, Any]:
+        return {
+            "version": self._snapshot.version,
+            "reload_count": self.reload_count,
+            "failed_reload_count": self.failed_reload_count,
+            "last_reload_latency": self.last_reload_latency,
+        }
@@ -0,0 +1,314 @@
+import argparse
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Sequence, Text, Tuple
+
+from . import settings
+from .data_store import DATA_FILE_ERRORS, file_signature, read_json_file
+from .fuzzy_match import FuzzyMatcher
+
+logger = logging.getLogger(__name__)
+
+GRID_CELLS = 64
+
+STREET_WORDS = {"ul", "ulica", "al", "aleja", "aleje", "os", "osiedle", "pl", "plac", "street", "st", "str"}
+# "ł" has no decomposition, so stripping accents alone would leave it in the name.
+LETTER_REPLACEMENTS = str.maketrans({"ł": "l", "Ł": "L"})
+NUMBER_LAST_PATTERN = re.compile(r"^(?P<street>\D+?)\s*(?P<number>\d+)\s*[a-z]?(?:\s*/\s*\w+)?$")
+NUMBER_FIRST_PATTERN = re.compile(r"^(?P<number>\d+)\s*[a-z]?(?:\s*/\s*\w+)?\s+(?P<street>\D+)$")
+
+Point = Tuple[float, float]
+Ring = Tuple[Point, ...]
+
+
+def normalize_street(name: Text) -> Text:
+    decomposed = unicodedata.normalize("NFKD", name.translate(LETTER_REPLACEMENTS))
+    plain = "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+    return " ".join(word for word in re.sub(r"[^\w]+", " ", plain).split() if word not in STREET_WORDS)
+
+
+def parse_address(address: Text) -> Optional[Tuple[Text, int]]:
+    # "ul. Grodzka 24/3", "Grodzka 24, Kraków" and "24 Grodzka street" all become ("grodzka", 24); anything after
+    # the first comma (city, postal code) is dropped.
+    street_part = address.split(",", 1)[0].strip()
+    match = NUMBER_LAST_PATTERN.match(street_part) or NUMBER_FIRST_PATTERN.match(street_part)
+    if match is None:
+        return None
+    street = normalize_street(match.group("street"))
+    return (street, int(match.group("number"))) if street else None
+
+
+class Street(NamedTuple):
+    name: Text
+    first_number: int
+    last_number: int
+    start: Point
+    end: Point
+
+    def locate(self, number: int) -> Optional[Point]:
+        # House numbers are spread evenly along the street between its two ends.
+        if not self.first_number <= number <= self.last_number:
+            return None
+        fraction = (number - self.first_number) / max(self.last_number - self.first_number, 1)
+        return (self.start[0] + (self.end[0] - self.start[0]) * fraction,
+                self.start[1] + (self.end[1] - self.start[1]) * fraction)
+
+
+class Gazetteer:
+    def __init__(self, document: Dict[Text, Any]):
+        self.streets: List[Street] = []
+        self._index: Dict[Text, int] = {}
+        for entry in document.get("streets", []):
+            position = len(self.streets)
+            first_number, last_number = entry.get("numbers", [1, 1])
+            self.streets.append(Street(entry["name"], first_number, last_number, tuple(entry["start"]),
+                                       tuple(entry["end"])))
+            for name in [entry["name"]] + entry.get("aliases", []):
+                self._index.setdefault(normalize_street(name), position)
+        self._fuzzy_matcher = FuzzyMatcher(self._index)
+
+    def find(self, street_key: Text) -> Optional[Street]:
+        position = self._index.get(street_key)
+        if position is None:
+            position = self._fuzzy_matcher.match(street_key)
+        return self.streets[position] if position is not None else None
+
+
+def ring_contains(ring: Ring, x: float, y: float) -> bool:
+    inside = False
+    previous_x, previous_y = ring[-1]
+    for current_x, current_y in ring:
+        if (current_y > y) != (previous_y > y) and \
+                x < (previous_x - current_x) * (y - current_y) / (previous_y - current_y) + current_x:
+            inside = not inside
+        previous_x, previous_y = current_x, current_y
+    return inside
+
+
+class DeliveryZone(NamedTuple):
+    zone_id: Text
+    name: Text
+    delivery_minutes: int
+    polygons: Tuple[Tuple[Ring, Tuple[Ring, ...]], ...]
+    bounds: Tuple[float, float, float, float]
+
+    def contains(self, x: float, y: float) -> bool:
+        min_x, min_y, max_x, max_y = self.bounds
+        if not (min_x <= x <= max_x and min_y <= y <= max_y):
+            return False
+        return any(ring_contains(outer, x, y) and not any(ring_contains(hole, x, y) for hole in holes)
+                   for outer, holes in self.polygons)
+
+
+def load_zones(document: Dict[Text, Any]) -> List[DeliveryZone]:
+    # GeoJSON FeatureCollection of Polygon and MultiPolygon features, coordinates in [longitude, latitude] order.
+    zones = []
+    for feature in document.get("features", []):
+        geometry = feature.get("geometry") or {}
+        if geometry.get("type") == "Polygon":
+            polygons = [geometry["coordinates"]]
+        elif geometry.get("type") == "MultiPolygon":
+            polygons = geometry["coordinates"]
+        else:
+            raise ValueError(f"Unsupported delivery zone geometry: {geometry.get('type')}")
+
+        rings = tuple((tuple(map(tuple, polygon[0])), tuple(tuple(map(tuple, hole)) for hole in polygon[1:]))
+                      for polygon in polygons)
+        xs = [x for outer, _ in rings for x, _ in outer]
+        ys = [y for outer, _ in rings for _, y in outer]
+        properties = feature.get("properties") or {}
+        zones.append(DeliveryZone(str(properties.get("id", len(zones))), properties.get("name", ""),
+                                  int(properties.get("delivery_minutes", 30)), rings,
+                                  (min(xs), min(ys), max(xs), max(ys))))
+    return zones
+
+
+# A uniform grid over the zones' combined bounds; each cell lists the zones whose bounding box touches it, in file
+# order, so a lookup tests only a handful of polygons and the first zone listed wins where zones overlap.
+class ZoneIndex:
+    def __init__(self, zones: Sequence[DeliveryZone], grid_cells: int = GRID_CELLS):
+        self.zones = list(zones)
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        if not self.zones:
+            self._origin, self._cell_size = (0.0, 0.0), 1.0
+            return
+
+        min_x = min(zone.bounds[0] for zone in self.zones)
+        min_y = min(zone.bounds[1] for zone in self.zones)
+        max_x = max(zone.bounds[2] for zone in self.zones)
+        max_y = max(zone.bounds[3] for zone in self.zones)
+        self._origin = (min_x, min_y)
+        self._cell_size = max(max_x - min_x, max_y - min_y, 1e-9) / grid_cells
+
+        for position, zone in enumerate(self.zones):
+            first_column, first_row = self._cell(zone.bounds[0], zone.bounds[1])
+            last_column, last_row = self._cell(zone.bounds[2], zone.bounds[3])
+            for column in range(first_column, last_column + 1):
+                for row in range(first_row, last_row + 1):
+                    self._cells.setdefault((column, row), []).append(position)
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return (math.floor((x - self._origin[0]) / self._cell_size),
+                math.floor((y - self._origin[1]) / self._cell_size))
+
+    def zone_at(self, point: Point) -> Optional[DeliveryZone]:
+        for position in self._cells.get(self._cell(*point), ()):
+            zone = self.zones[position]
+            if zone.contains(*point):
+                return zone
+        return None
+
+
+class TTLCache:
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class AddressCheck(NamedTuple):
+    address: Optional[Text]
+    point: Optional[Point]
+    zone: Optional[DeliveryZone]
+
+
+UNKNOWN_ADDRESS = AddressCheck(None, None, None)
+
+
+class DeliveryArea(NamedTuple):
+    gazetteer: Gazetteer
+    zone_index: ZoneIndex
+    cache: TTLCache
+
+
+# Addresses are checked against local files only. Results, including unknown and out-of-zone addresses, are cached
+# by the address as typed (case and spacing aside), so a repeat lookup skips parsing as well as the index. The files
+# are re-checked at most once per poll interval on access; a change swaps in a new index with an empty cache.
+class DeliveryZones:
+    def __init__(self, zones_path: Text, gazetteer_path: Text, poll_interval: float = 2.0, cache_size: int = 4096,
+                 ttl: float = 3600.0):
+        self.zones_path = zones_path
+        self.gazetteer_path = gazetteer_path
+        self.poll_interval = poll_interval
+        self.cache_size = cache_size
+        self.ttl = ttl
+
+        self._reload_lock = threading.Lock()
+        self._checked_at = time.monotonic()
+        self._signatures = self._current_signatures()
+        self._area = self._build_area()
+
+    @property
+    def available(self) -> bool:
+        return self._area is not None
+
+    def _current_signatures(self):
+        return file_signature(self.zones_path), file_signature(self.gazetteer_path)
+
+    def _build_area(self) -> Optional[DeliveryArea]:
+        zones_signature, gazetteer_signature = self._signatures
+        if zones_signature is None or gazetteer_signature is None:
+            return None
+        return DeliveryArea(Gazetteer(read_json_file(self.gazetteer_path)),
+                            ZoneIndex(load_zones(read_json_file(self.zones_path))),
+                            TTLCache(self.cache_size, self.ttl))
+
+    def check_for_changes(self) -> None:
+        self._checked_at = time.monotonic()
+        signatures = self._current_signatures()
+        if signatures == self._signatures:
+            return
+        with self._reload_lock:
+            self._signatures = signatures
+            try:
+                self._area = self._build_area()
+            except DATA_FILE_ERRORS as error:
+                # Keep serving the previous zones; the next change to the files is tried again.
+                logger.warning("Keeping delivery zones, reload failed: %s", error)
+
+    def zone(self, zone_id: Optional[Text]) -> Optional[DeliveryZone]:
+        area = self._area
+        if area is None or zone_id is None:
+            return None
+        return next((zone for zone in area.zone_index.zones if zone.zone_id == zone_id), None)
+
+    def check(self, address: Text) -> AddressCheck:
+        if time.monotonic() - self._checked_at > self.poll_interval:
+            self.check_for_changes()
+        area = self._area
+        if area is None:
+            return UNKNOWN_ADDRESS
+
+        key = " ".join(address.casefold().split())
+        result = area.cache.get(key)
+        if result is None:
+            result = self._lookup(area, address)
+            area.cache.put(key, result)
+        return result
+
+    def _lookup(self, area: DeliveryArea, address: Text) -> AddressCheck:
+        parsed = parse_address(address)
+        if parsed is None:
+            return UNKNOWN_ADDRESS
+        street_key, number = parsed
+        street = area.gazetteer.find(street_key)
+        point = street.locate(number) if street is not None else None
+        if point is None:
+            return UNKNOWN_ADDRESS
+        return AddressCheck(f"{street.name} {number}", point, area.zone_index.zone_at(point))
+
+    def stats(self) -> Dict[Text, Any]:
+        area = self._area
+        if area is None:
+            return {"available": False}
+        return {"available": True, "cached": len(area.cache), "hits": area.cache.hits, "misses": area.cache.misses}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check addresses against the delivery zones.")
+    parser.add_argument("addresses", nargs="+")
+    parser.add_argument("--zones", default=os.path.join(settings.DATA_DIR, "delivery_zones.geojson"))
+    parser.add_argument("--gazetteer", default=os.path.join(settings.DATA_DIR, "gazetteer.json"))
+    args = parser.parse_args()
+
+    delivery_zones = DeliveryZones(args.zones, args.gazetteer)
+    for address in args.addresses:
+        result = delivery_zones.check(address)
+        print(json.dumps({"input": address, "address": result.address, "point": result.point,
+                          "zone": result.zone.zone_id if result.zone else None}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+from collections import Counter, defaultdict
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, List, Optional, Set, Text
+
+SHORT_NAME_LENGTH = 4
+FREQUENT_TRIGRAM_RATIO = 64
+# A substitution, insertion or deletion touches three padded trigrams; swapping two adjacent letters touches four.
+TRIGRAMS_PER_EDIT = 4
+
+
+def trigrams(text: Text) -> Set[Text]:
+    padded = f"  {text} "
+    return {padded[position:position + 3] for position in range(len(padded) - 2)}
+
+
+def bounded_edit_distance(source: Text, target: Text, max_distance: int) -> Optional[int]:
+    # Optimal string alignment distance (an adjacent transposition counts as one edit). Only the diagonal band
+    # of width max_distance is filled and the search stops as soon as a whole row exceeds the bound, so the
+    # cost is O(len * max_distance). Returns None when the distance is larger than max_distance.
+    if abs(len(source) - len(target)) > max_distance:
+        return None
+    if source == target:
+        return 0
+    # A shared prefix or suffix never changes the distance; typos are usually local, so this leaves little to fill.
+    prefix = 0
+    while prefix < len(source) and prefix < len(target) and source[prefix] == target[prefix]:
+        prefix += 1
+    suffix = 0
+    while (suffix < len(source) - prefix and suffix < len(target) - prefix
+           and source[-1 - suffix] == target[-1 - suffix]):
+        suffix += 1
+    source, target = source[prefix:len(source) - suffix], target[prefix:len(target) - suffix]
+    limit = max_distance + 1
+    previous_previous: List[int] = []
+    previous = [column if column <= max_distance else limit for column in range(len(target) + 1)]
+    for i in range(1, len(source) + 1):
+        current = [limit] * (len(target) + 1)
+        if i <= max_distance:
+            current[0] = i
+        row_minimum = current[0]
+        source_char = source[i - 1]
+        for j in range(max(1, i - max_distance), min(len(target), i + max_distance) + 1):
+            target_char = target[j - 1]
+            value = min(previous[j - 1] + (source_char != target_char), previous[j] + 1, current[j - 1] + 1)
+            if i > 1 and j > 1 and source_char == target[j - 2] and source[i - 2] == target_char:
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+            if value < row_minimum:
+                row_minimum = value
+        if row_minimum > max_distance:
+            return None
+        previous_previous, previous = previous, current
+    return previous[-1] if previous[-1] <= max_distance else None
+
+
+# Candidates come from a character-trigram inverted index: a name within distance k of the query shares at least
+# len(query trigrams) - k * TRIGRAMS_PER_EDIT of them, and only those are checked with the bounded edit distance.
+class FuzzyMatcher:
+    def __init__(self, names: Dict[Text, int], max_distance: int = 2, cache_size: int = 4096):
+        self.max_distance = max_distance
+        self._names = list(names)
+        self._targets = [names[name] for name in self._names]
+        self._postings: Dict[Text, List[int]] = defaultdict(list)
+        for position, name in enumerate(self._names):
+            for trigram in trigrams(name):
+                self._postings[trigram].append(position)
+        self._postings = dict(self._postings)
+        self._positions_by_length: Dict[int, List[int]] = defaultdict(list)
+        for position, name in enumerate(self._names):
+            self._positions_by_length[len(name)].append(position)
+        self._positions_by_length = dict(self._positions_by_length)
+        self._frequent_posting_length = max(len(self._names) // FREQUENT_TRIGRAM_RATIO, 1)
+        self.match = lru_cache(maxsize=cache_size)(self._match)
+
+    def _match(self, query: Text) -> Optional[int]:
+        max_distance = 1 if len(query) <= SHORT_NAME_LENGTH else self.max_distance
+        query_trigrams = trigrams(query)
+        required = len(query_trigrams) - TRIGRAMS_PER_EDIT * max_distance
+
+        # Very common trigrams (word starts, mostly) are left out of the count; each one skipped lowers the
+        # threshold by one, and at least one scanned trigram still has to match.
+        postings = sorted((self._postings.get(trigram, ()) for trigram in query_trigrams), key=len)
+        skipped = 0
+        while skipped < required - 1 and len(postings[-1 - skipped]) > self._frequent_posting_length:
+            skipped += 1
+        scanned = postings[:len(postings) - skipped]
+        shared = Counter(chain.from_iterable(scanned))
+        if required <= 0:
+            # A short query can be within the bound of a name it shares no trigram with, so every name of a close
+            # enough length is a candidate as well.
+            for length in range(len(query) - max_distance, len(query) + max_distance + 1):
+                for position in self._positions_by_length.get(length, ()):
+                    shared.setdefault(position, 0)
+
+        candidates = sorted((-count, position) for position, count in shared.items() if count >= required - skipped)
+
+        best, best_distance = None, max_distance + 1
+        for negative_count, position in candidates:
+            # Beating the current best needs one edit fewer, and so more shared trigrams than this candidate has.
+            if -negative_count < len(query_trigrams) - TRIGRAMS_PER_EDIT * (best_distance - 1) - skipped:
+                break
+            distance = bounded_edit_distance(query, self._names[position], best_distance - 1)
+            if distance is not None:
+                best, best_distance = self._targets[position], distance
+                if distance == 0:
+                    break
+        return best
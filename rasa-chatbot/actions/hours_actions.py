@@ -0,0 +1,96 @@
+from typing import Any, Text, Dict, List
+
+from rasa_sdk import Action, Tracker
+from rasa_sdk.executor import CollectingDispatcher
+
+from .base import ActionBase
+from .opening_hours import format_time_of_day, parse_time_of_day
+from .state import now, snapshot_for
+
+
+class ActionCheckIsOpen(ActionBase, Action):
+    def name(self) -> Text:
+        return "action_check_is_open"
+
+    def handle(self, dispatcher: CollectingDispatcher, tracker: Tracker,
+               domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+        opening_hours_index = snapshot_for(tracker).opening_hours_index
+        entities = tracker.latest_message.get("entities")
+        day_entity = next((entity for entity in entities if entity["entity"] == "day"), None)
+        time_entity = next((entity for entity in entities if entity["entity"] == "time"), None)
+
+        minute_of_day = None
+        if day_entity and time_entity:
+            try:
+                minute_of_day = parse_time_of_day(time_entity["value"])
+            except (ValueError, TypeError):
+                # Only "H" and "H:MM" are understood; anything else, such as "10am", is asked about again.
+                self.count_branch("unparsed_time")
+
+        if minute_of_day is not None:
+            day = day_entity["value"]
+            time = time_entity["value"]
+
+            if opening_hours_index.has_day(day):
+                if opening_hours_index.is_open_weekly(day, minute_of_day):
+                    self.count_branch("open")
+                    dispatcher.utter_message(response="utter_is_open", day=day, time=time)
+                else:
+                    self.count_branch("closed")
+                    dispatcher.utter_message(text="No, the restaurant is closed at that time.")
+            else:
+                dispatcher.utter_message(text="Sorry, I don't have information for that day.")
+        else:
+            dispatcher.utter_message(text="Sorry, I didn't understand which day and time you're asking about.")
+
+        return []
+
+
+class ActionGetOpeningHours(ActionBase, Action):
+    def name(self) -> Text:
+        return "action_get_opening_hours"
+
+    def handle(self, dispatcher: CollectingDispatcher, tracker: Tracker,
+               domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+        opening_hours_index = snapshot_for(tracker).opening_hours_index
+        day = next(tracker.get_latest_entity_values("day"), None)
+
+        if day:
+            if opening_hours_index.has_day(day):
+                intervals = opening_hours_index.day_intervals(day)
+                if len(intervals) == 1:
+                    open_time, close_time = intervals[0]
+                    dispatcher.utter_message(response="utter_opening_hours", day=day,
+                                             open_time=format_time_of_day(open_time),
+                                             close_time=format_time_of_day(close_time))
+                elif intervals:
+                    shifts = " and ".join("from {} to {}".format(format_time_of_day(open_time),
+                                                                 format_time_of_day(close_time))
+                                          for open_time, close_time in intervals)
+                    dispatcher.utter_message(text=f"The restaurant is open on {day} {shifts}.")
+                else:
+                    dispatcher.utter_message(text=f"The restaurant is closed on {day}.")
+            else:
+                dispatcher.utter_message(text="Sorry, I don't have information for that day.")
+        else:
+            dispatcher.utter_message(text="Sorry, I didn't understand which day you're asking about.")
+
+        return []
+
+
+class ActionCheckCurrentlyOpen(ActionBase, Action):
+    def name(self) -> Text:
+        return "action_check_currently_open"
+
+    def handle(self, dispatcher: CollectingDispatcher, tracker: Tracker,
+               domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+        opening_hours_index = snapshot_for(tracker).opening_hours_index
+
+        if opening_hours_index.is_open(now()):
+            self.count_branch("open")
+            dispatcher.utter_message(response="utter_currently_open")
+        else:
+            self.count_branch("closed")
+            dispatcher.utter_message(response="utter_currently_closed")
+
+        return []
@@ -0,0 +1,69 @@
+from typing import Any, Dict, Iterable, List, Optional, Text
+
+from .fuzzy_match import FuzzyMatcher
+from .menu_rendering import DEFAULT_FORMAT, RENDERERS
+
+
+def normalize_name(name: Text) -> Text:
+    return " ".join(name.casefold().split())
+
+
+class MenuCatalog:
+    def __init__(self, items: List[Dict[Text, Any]]):
+        self.items = items
+        self.names = [item["name"] for item in items]
+        self.prices = [item["price"] for item in items]
+        self.preparation_times = [item["preparation_time"] for item in items]
+        self.ids = [item.get("id", index + 1) for index, item in enumerate(items)]
+        self._id_index = {item_id: index for index, item_id in enumerate(self.ids)}
+
+        self._name_index = {normalize_name(name): index for index, name in enumerate(self.names)}
+        self._alias_index = dict(self._name_index)
+        for index, item in enumerate(items):
+            for alias in item.get("aliases", []):
+                self._alias_index.setdefault(normalize_name(alias), index)
+        self._max_alias_words = max((len(alias.split()) for alias in self._alias_index), default=0)
+        self._fuzzy_matcher = FuzzyMatcher(self._alias_index)
+        self._rendered: Dict[Text, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, name: Text) -> bool:
+        return self.find(name) is not None
+
+    def find(self, name: Text) -> Optional[int]:
+        return self._alias_index.get(normalize_name(name))
+
+    def find_fuzzy(self, name: Text) -> Optional[int]:
+        normalized = normalize_name(name)
+        index = self._alias_index.get(normalized)
+        return index if index is not None else self._fuzzy_matcher.match(normalized)
+
+    def find_by_id(self, item_id: int) -> Optional[int]:
+        return self._id_index.get(item_id)
+
+    def get(self, name: Text) -> Optional[Dict[Text, Any]]:
+        index = self.find(name)
+        return self.items[index] if index is not None else None
+
+    def canonical_name(self, name: Text) -> Optional[Text]:
+        index = self.find(name)
+        return self.names[index] if index is not None else None
+
+    def resolve(self, text: Text) -> Optional[int]:
+        words = normalize_name(text).split()
+        for length in range(min(len(words), self._max_alias_words), 0, -1):
+            index = self._alias_index.get(" ".join(words[:length]))
+            if index is not None:
+                return index
+        return None
+
+    def max_preparation_time(self, indices: Iterable[int]) -> float:
+        return max((self.preparation_times[index] for index in indices), default=0)
+
+    def render(self, format_name: Text = DEFAULT_FORMAT) -> Any:
+        rendered = self._rendered.get(format_name)
+        if rendered is None:
+            rendered = self._rendered[format_name] = RENDERERS[format_name](self)
+        return rendered
@@ -0,0 +1,26 @@
+from typing import Any, Text, Dict, List
+
+from rasa_sdk import Action, Tracker
+from rasa_sdk.executor import CollectingDispatcher
+
+from .base import ActionBase
+from .menu_rendering import format_for_channel
+from .state import snapshot_for
+
+
+class ActionListMenu(ActionBase, Action):
+    def name(self) -> Text:
+        return "action_list_menu"
+
+    def handle(self, dispatcher: CollectingDispatcher, tracker: Tracker,
+               domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+        menu_catalog = snapshot_for(tracker).menu_catalog
+        format_name = format_for_channel(tracker.get_latest_input_channel())
+
+        self.count_branch(format_name)
+        if format_name == "json":
+            dispatcher.utter_message(json_message=menu_catalog.render(format_name))
+        else:
+            dispatcher.utter_message(text=menu_catalog.render(format_name))
+
+        return []
@@ -0,0 +1,56 @@
+from typing import Any, Callable, Dict, Text
+
+from . import settings
+
+COLUMNS = [("Name", "names"), ("Price", "prices"), ("Preparation_time", "preparation_times")]
+
+CHANNEL_FORMATS = {
+    "telegram": "text",
+    "twilio": "text",
+}
+DEFAULT_FORMAT = "markdown"
+
+
+def _table_cells(catalog):
+    columns = [[str(value) for value in getattr(catalog, attribute)] for _, attribute in COLUMNS]
+    widths = [max([len(header)] + [len(cell) for cell in cells]) for (header, _), cells in zip(COLUMNS, columns)]
+    return columns, widths
+
+
+def render_markdown(catalog) -> Text:
+    columns, widths = _table_cells(catalog)
+
+    lines = ["```markdown"]
+    lines.append("| " + " | ".join(header.center(width) for (header, _), width in zip(COLUMNS, widths)) + " |")
+    lines.append("|" + "|".join("-" * (width + 2) for width in widths) + "|")
+    for row in zip(*columns):
+        lines.append("| " + " | ".join(cell.center(width) for cell, width in zip(row, widths)) + " |")
+    lines.append("```")
+
+    return "\n".join(lines)
+
+
+def render_text(catalog) -> Text:
+    return "\n".join(f"{name} - {price} (ready in {prep_time} h)"
+                     for name, price, prep_time in zip(catalog.names, catalog.prices, catalog.preparation_times))
+
+
+def render_json(catalog) -> Dict[Text, Any]:
+    return {
+        "menu": [{"name": name, "price": price, "preparation_time": prep_time}
+                 for name, price, prep_time in zip(catalog.names, catalog.prices, catalog.preparation_times)]
+    }
+
+
+RENDERERS: Dict[Text, Callable[[Any], Any]] = {
+    "markdown": render_markdown,
+    "text": render_text,
+    "json": render_json,
+}
+
+
+def format_for_channel(channel: Text) -> Text:
+    # Custom payloads are invisible in the stock chat widgets, so the JSON menu is only sent where it was asked for.
+    if channel in settings.JSON_MENU_CHANNELS:
+        return "json"
+    return CHANNEL_FORMATS.get(channel, DEFAULT_FORMAT)
@@ -0,0 +1,110 @@
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Text, Tuple
+
+from . import settings
+
+ENABLED = settings.METRICS_ENABLED
+
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+PAYLOAD_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 16384, 65536)
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[Text, int]]:
+        total = 0
+        rows = []
+        for bound, count in zip(list(self.buckets) + ["+Inf"], self.counts):
+            total += count
+            rows.append((str(bound), total))
+        return rows
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency: Dict[Text, Histogram] = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+        self.payload: Dict[Text, Histogram] = defaultdict(lambda: Histogram(PAYLOAD_BUCKETS))
+        self.messages: Dict[Text, int] = defaultdict(int)
+        self.errors: Dict[Text, int] = defaultdict(int)
+        self.branches: Dict[Tuple[Text, Text], int] = defaultdict(int)
+
+    def observe_run(self, action: Text, seconds: float, message_count: int, events: Optional[List[Any]]) -> None:
+        payload_size = len(json.dumps(events or [], default=str))
+        with self._lock:
+            self.latency[action].observe(seconds)
+            self.payload[action].observe(payload_size)
+            self.messages[action] += message_count
+
+    def count_error(self, action: Text) -> None:
+        with self._lock:
+            self.errors[action] += 1
+
+    def count_branch(self, action: Text, branch: Text) -> None:
+        with self._lock:
+            self.branches[(action, branch)] += 1
+
+    def render(self) -> Text:
+        with self._lock:
+            lines = []
+            self._render_histogram(lines, "action_latency_seconds", "Time spent running an action.", self.latency)
+            self._render_histogram(lines, "action_slot_payload_bytes", "Serialized size of the returned events.",
+                                   self.payload)
+
+            lines.append("# HELP action_messages_total Messages sent to the user by an action.")
+            lines.append("# TYPE action_messages_total counter")
+            lines.extend(f'action_messages_total{{action="{action}"}} {count}'
+                         for action, count in sorted(self.messages.items()))
+
+            lines.append("# HELP action_errors_total Action runs that raised an exception.")
+            lines.append("# TYPE action_errors_total counter")
+            lines.extend(f'action_errors_total{{action="{action}"}} {count}'
+                         for action, count in sorted(self.errors.items()))
+
+            lines.append("# HELP action_branch_total Times an action took a given response branch.")
+            lines.append("# TYPE action_branch_total counter")
+            lines.extend(f'action_branch_total{{action="{action}",branch="{branch}"}} {count}'
+                         for (action, branch), count in sorted(self.branches.items()))
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _render_histogram(lines: List[Text], name: Text, description: Text,
+                          histograms: Dict[Text, Histogram]) -> None:
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} histogram")
+        for action, histogram in sorted(histograms.items()):
+            for bound, total in histogram.cumulative():
+                lines.append(f'{name}_bucket{{action="{action}",le="{bound}"}} {total}')
+            lines.append(f'{name}_sum{{action="{action}"}} {histogram.sum}')
+            lines.append(f'{name}_count{{action="{action}"}} {histogram.count}')
+
+
+REGISTRY = MetricsRegistry()
+
+
+def instrumented_call(action, handle, dispatcher, tracker, domain):
+    action_name = action.name()
+    message_count = len(dispatcher.messages)
+    started = time.perf_counter()
+    try:
+        events = handle(dispatcher, tracker, domain)
+    except Exception:
+        REGISTRY.count_error(action_name)
+        raise
+    REGISTRY.observe_run(action_name, time.perf_counter() - started, len(dispatcher.messages) - message_count, events)
+    return events
@@ -0,0 +1,36 @@
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Text
+
+from . import metrics, settings
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        body = metrics.REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+
+
+def start_metrics_server(host: Text = "127.0.0.1", port: int = settings.METRICS_PORT) -> ThreadingHTTPServer:
+    global _server
+    if _server is None:
+        _server = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+        threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        logger.info("Serving action metrics on http://%s:%d/metrics", host, port)
+    return _server
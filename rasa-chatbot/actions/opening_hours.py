@@ -0,0 +1,202 @@
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Text, Tuple, Union
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+# Internally minutes count from this Monday, so minute % MINUTES_PER_WEEK is the minute of the week.
+EPOCH = datetime(1970, 1, 5)
+EPOCH_ORDINAL = EPOCH.toordinal()
+
+# Integer moments in the public API are Unix time in minutes (timestamp // 60), read on the same wall clock as the
+# naive datetimes: for a restaurant that keeps UTC that is plain Unix time. They are shifted to the internal epoch
+# on the way in and back on the way out.
+UNIX_EPOCH = datetime(1970, 1, 1)
+UNIX_EPOCH_OFFSET = (EPOCH - UNIX_EPOCH) // timedelta(minutes=1)
+
+Moment = Union[datetime, int]
+
+
+def parse_time_of_day(value: Union[int, float, Text]) -> int:
+    if isinstance(value, str):
+        hours, _, minutes = value.partition(":")
+        return int(hours) * 60 + int(minutes or 0)
+    return int(round(value * 60))
+
+
+def parse_shifts(day_hours: Any) -> List[Tuple[int, int]]:
+    if isinstance(day_hours, dict):
+        day_hours = day_hours.get("shifts", [day_hours])
+    return [(parse_time_of_day(shift["open"]), parse_time_of_day(shift["close"])) for shift in day_hours]
+
+
+def merge_intervals(intervals: Iterable[Tuple[int, int]]) -> List[int]:
+    boundaries: List[int] = []
+    for start, end in sorted(intervals):
+        if start >= end:
+            continue
+        if boundaries and start <= boundaries[-1]:
+            boundaries[-1] = max(boundaries[-1], end)
+        else:
+            boundaries.extend((start, end))
+    return boundaries
+
+
+def to_minute(moment: Moment) -> int:
+    if isinstance(moment, int):
+        return moment - UNIX_EPOCH_OFFSET
+    return (moment.toordinal() - EPOCH_ORDINAL) * MINUTES_PER_DAY + moment.hour * 60 + moment.minute
+
+
+def from_minute(minute: int) -> datetime:
+    return EPOCH + timedelta(minutes=minute)
+
+
+def format_time_of_day(minute: int) -> Union[int, Text]:
+    hours, minutes = divmod(minute, 60)
+    return hours if not minutes else f"{hours}:{minutes:02d}"
+
+
+class OpeningHoursIndex:
+    def __init__(self, opening_hours: Dict[Text, Any], holidays: Optional[Dict[Text, Any]] = None):
+        self.opening_hours = opening_hours
+        self._day_intervals: Dict[Text, List[Tuple[int, int]]] = {}
+
+        weekly = []
+        for day, day_hours in opening_hours.items():
+            offset = WEEKDAYS.index(day) * MINUTES_PER_DAY
+            shifts = parse_shifts(day_hours)
+            self._day_intervals[day] = [shift for shift in shifts if shift[0] != shift[1]]
+            for open_minute, close_minute in shifts:
+                if open_minute == close_minute:
+                    continue
+                if close_minute < open_minute:
+                    close_minute += MINUTES_PER_DAY
+                start, end = offset + open_minute, offset + close_minute
+                if end > MINUTES_PER_WEEK:
+                    weekly.append((0, end - MINUTES_PER_WEEK))
+                    end = MINUTES_PER_WEEK
+                weekly.append((start, end))
+        self._weekly = merge_intervals(weekly)
+
+        # Holiday shifts replace the weekly schedule for that calendar day and are clipped to it. The replaced day's
+        # overnight shifts no longer run into the next morning, so that next day gets an override with only its
+        # own shifts.
+        self._holidays: Dict[int, List[int]] = {}
+        for day, day_hours in (holidays or {}).items():
+            day_number = date.fromisoformat(day).toordinal() - EPOCH_ORDINAL
+            shifts = [(start, min(end, MINUTES_PER_DAY)) for start, end in parse_shifts(day_hours) if start < end]
+            self._holidays[day_number] = merge_intervals(shifts)
+        for day_number in list(self._holidays):
+            next_day = day_number + 1
+            replaced_shifts = self.day_intervals(WEEKDAYS[day_number % 7])
+            if next_day in self._holidays or not any(0 < end < start for start, end in replaced_shifts):
+                continue
+            own_shifts = self.day_intervals(WEEKDAYS[next_day % 7])
+            self._holidays[next_day] = merge_intervals((start, end if start < end else MINUTES_PER_DAY)
+                                                       for start, end in own_shifts)
+        self._holiday_days = sorted(self._holidays)
+
+    def has_day(self, day: Text) -> bool:
+        return day in self._day_intervals
+
+    def day_intervals(self, day: Text) -> List[Tuple[int, int]]:
+        return self._day_intervals.get(day, [])
+
+    def is_open_weekly(self, day: Text, minute_of_day: int) -> bool:
+        minute_of_week = WEEKDAYS.index(day) * MINUTES_PER_DAY + minute_of_day
+        return bisect_right(self._weekly, minute_of_week % MINUTES_PER_WEEK) % 2 == 1
+
+    def _is_open(self, minute: int) -> bool:
+        if self._holidays:
+            day_number = minute // MINUTES_PER_DAY
+            holiday = self._holidays.get(day_number)
+            if holiday is not None:
+                return bisect_right(holiday, minute - day_number * MINUTES_PER_DAY) % 2 == 1
+        return bisect_right(self._weekly, minute % MINUTES_PER_WEEK) % 2 == 1
+
+    def _next_boundary(self, minute: int) -> Optional[int]:
+        candidates = []
+
+        if self._weekly:
+            week_start = minute - minute % MINUTES_PER_WEEK
+            position = bisect_right(self._weekly, minute - week_start)
+            if position < len(self._weekly):
+                candidates.append(week_start + self._weekly[position])
+            else:
+                candidates.append(week_start + MINUTES_PER_WEEK + self._weekly[0])
+
+        if self._holidays:
+            day_number = minute // MINUTES_PER_DAY
+            holiday = self._holidays.get(day_number)
+            if holiday is not None:
+                day_start = day_number * MINUTES_PER_DAY
+                position = bisect_right(holiday, minute - day_start)
+                if position < len(holiday):
+                    candidates.append(day_start + holiday[position])
+                candidates.append(day_start + MINUTES_PER_DAY)
+            position = bisect_right(self._holiday_days, day_number)
+            if position < len(self._holiday_days):
+                candidates.append(self._holiday_days[position] * MINUTES_PER_DAY)
+
+        return min(candidates) if candidates else None
+
+    def _next_change(self, minute: int, to_open: bool) -> Optional[int]:
+        if self._is_open(minute) == to_open:
+            return minute
+        horizon = max(minute, self._holiday_days[-1] * MINUTES_PER_DAY if self._holiday_days else 0)
+        horizon += MINUTES_PER_WEEK + MINUTES_PER_DAY
+        cursor = minute
+        while cursor <= horizon:
+            cursor = self._next_boundary(cursor)
+            if cursor is None:
+                return None
+            if self._is_open(cursor) == to_open:
+                return cursor
+        return None
+
+    def is_open(self, moment: Moment) -> bool:
+        return self._is_open(to_minute(moment))
+
+    def next_opening(self, moment: Moment) -> Optional[Moment]:
+        return self._convert_back(moment, self._next_change(to_minute(moment), True))
+
+    def next_closing(self, moment: Moment) -> Optional[Moment]:
+        return self._convert_back(moment, self._next_change(to_minute(moment), False))
+
+    def is_open_many(self, moments: Sequence[Moment]) -> List[bool]:
+        minutes = self._to_minutes(moments)
+        if not self._holidays:
+            weekly = self._weekly
+            return [bisect_right(weekly, minute % MINUTES_PER_WEEK) % 2 == 1 for minute in minutes]
+        is_open = self._is_open
+        return [is_open(minute) for minute in minutes]
+
+    def next_opening_many(self, moments: Sequence[Moment]) -> List[Optional[Moment]]:
+        return self._next_change_many(moments, True)
+
+    def next_closing_many(self, moments: Sequence[Moment]) -> List[Optional[Moment]]:
+        return self._next_change_many(moments, False)
+
+    def _next_change_many(self, moments: Sequence[Moment], to_open: bool) -> List[Optional[Moment]]:
+        next_change = self._next_change
+        changes = [next_change(minute, to_open) for minute in self._to_minutes(moments)]
+        if moments and isinstance(moments[0], datetime):
+            return [from_minute(change) if change is not None else None for change in changes]
+        return [change + UNIX_EPOCH_OFFSET if change is not None else None for change in changes]
+
+    @staticmethod
+    def _to_minutes(moments: Sequence[Moment]) -> List[int]:
+        if moments and isinstance(moments[0], datetime):
+            return [to_minute(moment) for moment in moments]
+        return [moment - UNIX_EPOCH_OFFSET for moment in moments]
+
+    @staticmethod
+    def _convert_back(moment: Moment, minute: Optional[int]) -> Optional[Moment]:
+        if minute is None:
+            return None
+        if isinstance(moment, int):
+            return minute + UNIX_EPOCH_OFFSET
+        return from_minute(minute)
@@ -0,0 +1,314 @@
+from datetime import timedelta
+from typing import Any, Text, Dict, List, Optional
+
+from rasa_sdk import Action, Tracker
+from rasa_sdk.executor import CollectingDispatcher
+from rasa_sdk.events import SlotSet
+
+from .base import ActionBase
+from .data_store import DataSnapshot
+from .order_codec import decode_order, encode_order_line
+from .order_parser import parse_order
+from .responses import Template
+from .state import get_delivery_zones, kitchen_scheduler_for, now, snapshot_for
+from .tenants import location_id_for
+
+
+ORDER_MORE_PROMPT = ("Do you want to order anything else? If so, please let me know what you "
+                     "would like to order.")
+ORDER_TOTAL_MESSAGE = Template("Your order total so far is {}.")
+ITEMS_ADDED_MESSAGE = Template("{} {} been added to the order.")
+REMAINING_ITEMS_MESSAGE = Template("The remaining {} items couldn't be ordered.")
+CURRENT_ORDER_MESSAGE = Template("Your current order is: {}")
+DISCOUNT_MESSAGE = Template("{} applied: -{}.")
+ORDER_QUOTE_MESSAGE = Template("The total is {}, including {} tax.")
+PICKUP_TIME_MESSAGE = Template("Your order will be ready for pick-up at {}.")
+DELIVERY_TIME_MESSAGE = Template("Your order will be delivered around {}.")
+NOTHING_ORDERED_MESSAGE = ("Alright, it seems like you haven't ordered anything this time. "
+                           "We hope you find something for you next time. Goodbye and see you again!")
+DEFAULT_DELIVERY_MINUTES = 30
+
+
+def current_total(tracker: Tracker, snapshot: DataSnapshot) -> Optional[Text]:
+    order_total = tracker.get_slot("order_total")
+    if order_total is None and tracker.get_slot("current_order"):
+        # Conversations started before totals were tracked: price the existing order once, then add incrementally.
+        current_order = decode_order(tracker.get_slot("current_order"), snapshot.menu_catalog)
+        order_total = snapshot.pricing.add_to_total(None, current_order)
+    return order_total
+
+
+class ActionSingleItemOrder(ActionBase, Action):
+    def name(self) -> Text:
+        return "action_place_single_item_order"
+
+    def handle(self, dispatcher: CollectingDispatcher, tracker: Tracker,
+               domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+        snapshot = snapshot_for(tracker)
+        menu_catalog = snapshot.menu_catalog
+        parsed_order = parse_order(tracker.latest_message, menu_catalog)
+
+        if parsed_order.lines and parsed_order.lines[0].available:
+            order_line = parsed_order.lines[0]
+            dispatcher.utter_message(ITEMS_ADDED_MESSAGE.render(order_line.describe(), "has"))
+
+            order_total = snapshot.pricing.add_to_total(current_total(tracker, snapshot), [order_line])
+            current_order = tracker.get_slot("current_order") or []
+            current_order.append(encode_order_line(order_line, menu_catalog))
+
+            dispatcher.utter_message(ORDER_TOTAL_MESSAGE.render(snapshot.pricing.format(order_total)))
+            dispatcher.utter_message(ORDER_MORE_PROMPT)
+
+            return [SlotSet("current_order", current_order), SlotSet("order_total", order_total)]
+
+        self.count_branch("item_not_available")
+        dispatcher.utter_message("Sorry, we don't have that item in our menu.")
+        dispatcher.utter_message(ORDER_MORE_PROMPT)
+
+        return []
+
+
+class ActionPlaceOrderWithMultipleItems(ActionBase, Action):
+    def name(self) -> Text:
+        return "action_place_order_with_multiple_items"
+
+    def handle(self, dispatcher: CollectingDispatcher, tracker: Tracker,
+               domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+        snapshot = snapshot_for(tracker)
+        menu_catalog = snapshot.menu_catalog
+        parsed_order = parse_order(tracker.latest_message, menu_catalog)
+        available_lines = parsed_order.available_lines
+        available_items = [order_line.describe() for order_line in available_lines]
+        missing_count = parsed_order.missing_count
+
+        if not available_items:
+            self.count_branch("no_items_available")
+            dispatcher.utter_message("Sorry, we don't have the items in our menu.")
+            dispatcher.utter_message(ORDER_MORE_PROMPT)
+            return []
+
+        if len(available_items) == 1:
+            dispatcher.utter_message(ITEMS_ADDED_MESSAGE.render(available_items[0], "has"))
+        else:
+            dispatcher.utter_message(ITEMS_ADDED_MESSAGE.render(", ".join(available_items), "have"))
+
+        if missing_count:
+            self.count_branch("remaining_items_not_ordered")
+        if missing_count > 1:
+            dispatcher.utter_message(REMAINING_ITEMS_MESSAGE.render(missing_count))
+        elif missing_count == 1:
+            dispatcher.utter_message("The remaining item couldn't be ordered.")
+
+        order_total = snapshot.pricing.add_to_total(current_total(tracker, snapshot), available_lines)
+        dispatcher.utter_message(ORDER_TOTAL_MESSAGE.render(snapshot.pricing.format(order_total)))
+        dispatcher.utter_message(ORDER_MORE_PROMPT)
+
+        current_order = tracker.get_slot("current_order") or []
+        current_order.extend(encode_order_line(order_line, menu_catalog) for order_line in available_lines)
+
+        return [SlotSet("current_order", current_order), SlotSet("order_total", order_total)]
+
+
+class ActionPlaceOrderWithAdditionalRequest(ActionBase, Action):
+    def name(self) -> Text:
+        return "action_place_order_with_additional_request"
+
+    def handle(self, dispatcher: CollectingDispatcher, tracker: Tracker,
+               domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+        snapshot = snapshot_for(tracker)
+        menu_catalog = snapshot.menu_catalog
+        parsed_order = parse_order(tracker.latest_message, menu_catalog)
+
+        if not parsed_order.lines or parsed_order.missing_count:
+            self.count_branch("order_too_complex")
+            dispatcher.utter_message("Sorry, it seems that your order is too complex for me to process at the moment. "
+                                     "Could you please simplify your order or provide it in separate messages?")
+            return []
+
+        if parsed_order.rejected_modifications or not all(line.modifications for line in parsed_order.lines):
+            self.count_branch("additional_request_rejected")
+            if len(parsed_order.lines) == 1:
+                dispatcher.utter_message("Sorry, the additional request for your order cannot be fulfilled. "
+                                         "The order has not been placed.")
+            else:
+                dispatcher.utter_message("Sorry, not all additional requests for your order can be fulfilled. "
+                                         "The order has not been placed.")
+            dispatcher.utter_message(ORDER_MORE_PROMPT)
+            return []
+
+        complete_order = [order_line.describe() for order_line in parsed_order.lines]
+        verb = "has" if len(complete_order) == 1 else "have"
+        dispatcher.utter_message(ITEMS_ADDED_MESSAGE.render(", ".join(complete_order), verb))
+
+        order_total = snapshot.pricing.add_to_total(current_total(tracker, snapshot), parsed_order.lines)
+        dispatcher.utter_message(ORDER_TOTAL_MESSAGE.render(snapshot.pricing.format(order_total)))
+        dispatcher.utter_message(ORDER_MORE_PROMPT)
+
+        current_order = tracker.get_slot("current_order") or []
+        current_order.extend(encode_order_line(order_line, menu_catalog) for order_line in parsed_order.lines)
+
+        return [SlotSet("current_order", current_order), SlotSet("order_total", order_total)]
+
+
+class ActionConfirmOrder(ActionBase, Action):
+    offload = False
+
+    def name(self) -> Text:
+        return "action_confirm_order"
+
+    def handle(self, dispatcher: CollectingDispatcher, tracker: Tracker,
+               domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+        snapshot = snapshot_for(tracker)
+        current_order = decode_order(tracker.get_slot("current_order"), snapshot.menu_catalog)
+
+        if current_order:
+            dispatcher.utter_message(CURRENT_ORDER_MESSAGE.render(
+                ", ".join(order_line.describe() for order_line in current_order)))
+            quote = snapshot.pricing.quote(current_order)
+            if quote.discount:
+                dispatcher.utter_message(DISCOUNT_MESSAGE.render(", ".join(quote.applied_discounts),
+                                                                 snapshot.pricing.format(quote.discount)))
+            dispatcher.utter_message(ORDER_QUOTE_MESSAGE.render(
+                snapshot.pricing.format(quote.total), snapshot.pricing.format(quote.tax)))
+            dispatcher.utter_message("Is your order correct?")
+        else:
+            dispatcher.utter_message(NOTHING_ORDERED_MESSAGE)
+
+        return []
+
+
+class ActionResetOrder(ActionBase, Action):
+    offload = False
+
+    def name(self) -> Text:
+        return "action_reset_order"
+
+    def handle(self, dispatcher: CollectingDispatcher, tracker: Tracker,
+               domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+        dispatcher.utter_message("You didn't confirm your order so it got reset. Please order again.")
+        return [SlotSet("current_order", None), SlotSet("order_total", None)]
+
+
+class ActionConfirmAddress(ActionBase, Action):
+    def name(self) -> Text:
+        return "action_confirm_address"
+
+    def handle(self, dispatcher: CollectingDispatcher, tracker: Tracker,
+               domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+        address = next(tracker.get_latest_entity_values("address"), None)
+        delivery_zones = get_delivery_zones()
+
+        if address and not delivery_zones.available:
+            # Without zone data every address is accepted, as before delivery zones existed.
+            dispatcher.utter_message(text=f"Is {address} your delivery address?")
+            return [SlotSet("address", address)]
+
+        address_check = delivery_zones.check(address) if address else None
+        if address_check is not None and address_check.address is None:
+            self.count_branch("unknown_address")
+            dispatcher.utter_message(text=f"Sorry, I couldn't find {address}. "
+                                          "Could you check the street name and house number?")
+            # The from_entity mapping has already stored the unverified address; it must not be delivered to.
+            return [SlotSet("address", None), SlotSet("delivery_zone", None)]
+
+        if address_check is not None and address_check.zone is not None:
+            self.count_branch(f"zone_{address_check.zone.zone_id}")
+            dispatcher.utter_message(text=f"Is {address_check.address} your delivery address?")
+            return [SlotSet("address", address_check.address), SlotSet("delivery_zone", address_check.zone.zone_id)]
+
+        self.count_branch("outside_delivery_zones")
+        dispatcher.utter_message(
+            text="Sorry, we don't deliver to your address.")
+        return [SlotSet("current_order", None), SlotSet("order_total", None), SlotSet("address", None),
+                SlotSet("delivery_zone", None)]
+
+
+class ActionConfirmPickupTime(ActionBase, Action):
+    def name(self) -> Text:
+        return "action_confirm_pickup_time"
+
+    def handle(self, dispatcher: CollectingDispatcher, tracker: Tracker,
+               domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+        snapshot = snapshot_for(tracker)
+        available_lines = [order_line for order_line in decode_order(tracker.get_slot("current_order"),
+                                                                     snapshot.menu_catalog) if order_line.available]
+        if not available_lines:
+            # Nothing to prepare, so no kitchen time is booked.
+            self.count_branch("nothing_ordered")
+            dispatcher.utter_message(NOTHING_ORDERED_MESSAGE)
+            return [SlotSet("current_order", None), SlotSet("order_total", None)]
+
+        max_prep_time = snapshot.menu_catalog.max_preparation_time(order_line.menu_index
+                                                                   for order_line in available_lines)
+
+        current_time = now()
+
+        if not snapshot.opening_hours_index.is_open(current_time):
+            self.count_branch("restaurant_closed")
+            dispatcher.utter_message("Apologies, the restaurant is currently closed.")
+            return [SlotSet("current_order", None), SlotSet("order_total", None)]
+
+        kitchen_scheduler = kitchen_scheduler_for(location_id_for(tracker))
+        kitchen_slot = kitchen_scheduler.schedule(current_time, timedelta(hours=max_prep_time),
+                                                  snapshot.opening_hours_index)
+        if kitchen_slot is None:
+            self.count_branch("past_closing_time")
+            dispatcher.utter_message("It's too late to place an order for that time. The restaurant will be closed.")
+            return [SlotSet("current_order", None), SlotSet("order_total", None)]
+
+        pickup_time = kitchen_slot.ready
+
+        dispatcher.utter_message(PICKUP_TIME_MESSAGE.render(pickup_time.strftime("%I:%M %p")))
+
+        return [SlotSet("current_order", None), SlotSet("order_total", None)]
+
+
+class ActionConfirmDeliveryTime(ActionBase, Action):
+    def name(self) -> Text:
+        return "action_confirm_delivery_time"
+
+    def handle(self, dispatcher: CollectingDispatcher, tracker: Tracker,
+               domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+        snapshot = snapshot_for(tracker)
+        available_lines = [order_line for order_line in decode_order(tracker.get_slot("current_order"),
+                                                                     snapshot.menu_catalog) if order_line.available]
+        if not available_lines:
+            # Nothing to prepare, so no kitchen time is booked.
+            self.count_branch("nothing_ordered")
+            dispatcher.utter_message(NOTHING_ORDERED_MESSAGE)
+            return [SlotSet("current_order", None), SlotSet("order_total", None)]
+
+        max_prep_time = snapshot.menu_catalog.max_preparation_time(order_line.menu_index
+                                                                   for order_line in available_lines)
+
+        delivery_zones = get_delivery_zones()
+        delivery_zone = delivery_zones.zone(tracker.get_slot("delivery_zone"))
+        if delivery_zones.available and delivery_zone is None:
+            self.count_branch("address_not_verified")
+            dispatcher.utter_message("Sorry, I couldn't verify your delivery address. "
+                                     "Please tell me your address again.")
+            return [SlotSet("address", None)]
+
+        current_time = now()
+
+        if not snapshot.opening_hours_index.is_open(current_time):
+            self.count_branch("restaurant_closed")
+            dispatcher.utter_message("Apologies, the restaurant is currently closed.")
+            return [SlotSet("current_order", None), SlotSet("order_total", None)]
+
+        kitchen_scheduler = kitchen_scheduler_for(location_id_for(tracker))
+        kitchen_slot = kitchen_scheduler.schedule(current_time, timedelta(hours=max_prep_time),
+                                                  snapshot.opening_hours_index)
+        if kitchen_slot is None:
+            self.count_branch("past_closing_time")
+            dispatcher.utter_message("It's too late to place an order for that time. The restaurant will be closed.")
+            return [SlotSet("current_order", None), SlotSet("order_total", None)]
+
+        order_time = kitchen_slot.ready
+
+        order_time += timedelta(minutes=delivery_zone.delivery_minutes if delivery_zone else DEFAULT_DELIVERY_MINUTES)
+        delivery_time = order_time.strftime("%I:%M %p")
+
+        dispatcher.utter_message(DELIVERY_TIME_MESSAGE.render(delivery_time))
+
+        return [SlotSet("current_order", None), SlotSet("order_total", None)]
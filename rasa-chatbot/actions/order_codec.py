@@ -0,0 +1,59 @@
+from typing import Iterable, List, Optional, Text, Union
+
+from .menu import MenuCatalog, normalize_name
+from .order_parser import INGREDIENTS, Modification, OrderLine
+
+# Slot entries look like "1:4:2:60": format version, menu item id, quantity and a hex modifier bitmask.
+# Bit (ingredient position * len(MODIFIER_CODES) + modifier position) is set for every requested change.
+ORDER_FORMAT_VERSION = 1
+MODIFIER_CODES = ("with", "without", "with extra")
+
+_INGREDIENT_POSITIONS = {ingredient: position for position, ingredient in enumerate(INGREDIENTS)}
+_MODIFIER_POSITIONS = {modifier: position for position, modifier in enumerate(MODIFIER_CODES)}
+
+
+def encode_modifications(modifications: Iterable[Modification]) -> int:
+    mask = 0
+    for modification in modifications:
+        ingredient = _INGREDIENT_POSITIONS[normalize_name(modification.ingredient)]
+        mask |= 1 << (ingredient * len(MODIFIER_CODES) + _MODIFIER_POSITIONS[modification.modifier])
+    return mask
+
+
+def decode_modifications(mask: int) -> List[Modification]:
+    modifications = []
+    bit = 0
+    while mask:
+        if mask & 1:
+            ingredient, modifier = divmod(bit, len(MODIFIER_CODES))
+            modifications.append(Modification(MODIFIER_CODES[modifier], INGREDIENTS[ingredient]))
+        mask >>= 1
+        bit += 1
+    return modifications
+
+
+def encode_order_line(order_line: OrderLine, menu_catalog: MenuCatalog) -> Text:
+    item_id = menu_catalog.ids[order_line.menu_index]
+    mask = encode_modifications(order_line.modifications)
+    return f"{ORDER_FORMAT_VERSION}:{item_id}:{order_line.quantity}:{mask:x}"
+
+
+def decode_order_entry(entry: Text, menu_catalog: MenuCatalog) -> Optional[OrderLine]:
+    fields = entry.split(":")
+    if len(fields) == 4 and fields[0] == str(ORDER_FORMAT_VERSION):
+        menu_index = menu_catalog.find_by_id(int(fields[1]))
+        if menu_index is None:
+            return None
+        return OrderLine(menu_catalog.names[menu_index], menu_index, int(fields[2]),
+                         tuple(decode_modifications(int(fields[3], 16))))
+
+    # Conversations started before the compact format keep free-form strings in the slot.
+    menu_index = menu_catalog.resolve(entry)
+    return OrderLine(entry.strip(), menu_index, 1, ()) if entry.strip() else None
+
+
+def decode_order(current_order: Union[Text, List[Text], None], menu_catalog: MenuCatalog) -> List[OrderLine]:
+    if isinstance(current_order, str):
+        current_order = current_order.split(',')
+    order_lines = (decode_order_entry(entry, menu_catalog) for entry in current_order or [])
+    return [order_line for order_line in order_lines if order_line is not None]
@@ -0,0 +1,135 @@
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Text, Tuple
+
+from .menu import MenuCatalog, normalize_name
+
+# Order matters: positions are used as bit offsets by order_codec, so only append new ingredients.
+INGREDIENTS = ("tomatoes", "meat", "mustard", "pickles", "ketchup", "onions", "cheese")
+ALLOWED_INGREDIENTS = frozenset(INGREDIENTS)
+
+MODIFIERS = {
+    "without": "without",
+    "no": "without",
+    "with extra": "with extra",
+    "extra": "with extra",
+    "with": "with",
+}
+
+QUANTITY_WORDS = {"a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+                  "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10}
+
+DELIMITER_PATTERN = re.compile(r",|;|&|\+|\band\b|\bplus\b", re.IGNORECASE)
+QUANTITY_PATTERN = re.compile(r"\b(\d+|" + "|".join(QUANTITY_WORDS) + r")\s*(?:x\s*)?$", re.IGNORECASE)
+WORD_PATTERN = re.compile(r"\w")
+
+
+class Modification(NamedTuple):
+    modifier: Text
+    ingredient: Text
+
+
+class OrderLine(NamedTuple):
+    item: Text
+    menu_index: Optional[int]
+    quantity: int
+    modifications: Tuple[Modification, ...]
+
+    @property
+    def available(self) -> bool:
+        return self.menu_index is not None
+
+    def describe(self) -> Text:
+        parts = [self.item]
+        parts.extend(f"{modification.modifier} {modification.ingredient}" for modification in self.modifications)
+        if self.quantity > 1:
+            parts.append(f"x{self.quantity}")
+        return " ".join(parts)
+
+
+class ParsedOrder(NamedTuple):
+    lines: List[OrderLine]
+    unrecognized: int
+    rejected_modifications: List[Modification]
+
+    @property
+    def available_lines(self) -> List[OrderLine]:
+        return [line for line in self.lines if line.available]
+
+    @property
+    def missing_count(self) -> int:
+        return self.unrecognized + sum(1 for line in self.lines if not line.available)
+
+
+def _positioned_entities(text: Text, entities: List[Dict[Text, Any]]) -> List[Tuple[int, int, Dict[Text, Any]]]:
+    positioned = []
+    cursor = 0
+    for entity in entities:
+        start, end = entity.get("start"), entity.get("end")
+        if start is None or end is None:
+            found = text.find(str(entity.get("value", "")), cursor)
+            start = found if found >= 0 else cursor
+            end = start + len(str(entity.get("value", "")))
+        positioned.append((start, end, entity))
+        cursor = end
+    positioned.sort(key=lambda positioned_entity: positioned_entity[0])
+    return positioned
+
+
+def _parse_quantity(prefix: Text) -> int:
+    match = QUANTITY_PATTERN.search(prefix)
+    if not match:
+        return 1
+    value = match.group(1).lower()
+    return int(value) if value.isdigit() else QUANTITY_WORDS[value]
+
+
+def parse_order(message: Dict[Text, Any], menu_catalog: MenuCatalog) -> ParsedOrder:
+    text = message.get("text") or ""
+    lines: List[List[Any]] = []
+    unrecognized = 0
+    rejected: List[Modification] = []
+    orphan_modifications: List[Modification] = []
+
+    pending_modifier = None
+    previous_end = 0
+
+    for start, end, entity in _positioned_entities(text, message.get("entities") or []):
+        gap = text[previous_end:start]
+        delimiters = list(DELIMITER_PATTERN.finditer(gap))
+        if delimiters:
+            for delimiter, following in zip(delimiters, delimiters[1:]):
+                if WORD_PATTERN.search(gap[delimiter.end():following.start()]):
+                    unrecognized += 1
+            gap = gap[delimiters[-1].end():]
+        previous_end = max(previous_end, end)
+
+        kind, value = entity.get("entity"), str(entity.get("value", ""))
+        if kind == "food":
+            menu_index = menu_catalog.find_fuzzy(value)
+            name = menu_catalog.names[menu_index] if menu_index is not None else value
+            lines.append([name, menu_index, _parse_quantity(gap), orphan_modifications])
+            orphan_modifications = []
+            pending_modifier = None
+        elif kind == "modifier":
+            pending_modifier = MODIFIERS.get(normalize_name(value).strip("[]() "))
+            if pending_modifier is None:
+                rejected.append(Modification(value, ""))
+        elif kind == "ingredient":
+            ingredient = normalize_name(value)
+            modification = Modification(pending_modifier or "with", value)
+            if ingredient not in ALLOWED_INGREDIENTS:
+                rejected.append(modification)
+            elif lines:
+                lines[-1][3].append(modification)
+            else:
+                orphan_modifications.append(modification)
+
+    tail = text[previous_end:]
+    delimiters = list(DELIMITER_PATTERN.finditer(tail))
+    for delimiter, following in zip(delimiters, delimiters[1:] + [None]):
+        if WORD_PATTERN.search(tail[delimiter.end():following.start() if following else len(tail)]):
+            unrecognized += 1
+
+    order_lines = [OrderLine(name, menu_index, quantity, tuple(modifications))
+                   for name, menu_index, quantity, modifications in lines]
+    return ParsedOrder(order_lines, unrecognized, rejected)
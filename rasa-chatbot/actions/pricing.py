@@ -0,0 +1,119 @@
+from collections import Counter
+from decimal import ROUND_HALF_UP, Decimal
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Text, Tuple, Union
+
+from .menu import MenuCatalog, normalize_name
+from .order_codec import MODIFIER_CODES, encode_modifications
+from .order_parser import INGREDIENTS, OrderLine
+
+CENT = Decimal("0.01")
+ZERO = Decimal("0")
+
+BasketSignature = Tuple[Tuple[int, int, int], ...]
+
+
+def to_amount(value: Any) -> Decimal:
+    # Prices come from JSON as ints, floats or strings; going through str keeps 12.5 from becoming 12.4999...
+    return Decimal(str(value)).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+class Quote(NamedTuple):
+    subtotal: Decimal
+    discount: Decimal
+    tax: Decimal
+    total: Decimal
+    applied_discounts: Tuple[Text, ...]
+
+
+# Modifier costs are built once per menu snapshot, one Decimal per modifier bit using the same bit layout as
+# order_codec, so a line costs its item price plus one addition per set bit of its modifier mask. Item prices are
+# converted on first use, which keeps a large mapped menu from being read in full when the snapshot loads.
+class PricingEngine:
+    def __init__(self, menu_catalog: MenuCatalog, rules: Optional[Dict[Text, Any]] = None, cache_size: int = 1024):
+        self.rules = rules or {}
+        self.currency = self.rules.get("currency", "")
+        self.tax_rate = Decimal(str(self.rules.get("tax_rate", 0)))
+        self.tax_included = self.rules.get("tax_included", True)
+        self.discounts = self.rules.get("discounts", [])
+
+        self._menu_prices = menu_catalog.prices
+        self._item_prices: Dict[int, Decimal] = {}
+        modifier_prices = self.rules.get("modifier_prices", {})
+        self.modifier_costs: List[Decimal] = []
+        for ingredient in INGREDIENTS:
+            for modifier in MODIFIER_CODES:
+                prices = {normalize_name(name): price for name, price in modifier_prices.get(modifier, {}).items()}
+                self.modifier_costs.append(to_amount(prices.get(ingredient, prices.get("default", 0))))
+
+        self._quote = lru_cache(maxsize=cache_size)(self._evaluate)
+
+    def modifier_cost(self, mask: int) -> Decimal:
+        cost = ZERO
+        bit = 0
+        while mask:
+            if mask & 1:
+                cost += self.modifier_costs[bit]
+            mask >>= 1
+            bit += 1
+        return cost
+
+    def item_price(self, menu_index: int) -> Decimal:
+        price = self._item_prices.get(menu_index)
+        if price is None:
+            price = self._item_prices[menu_index] = to_amount(self._menu_prices[menu_index])
+        return price
+
+    def unit_price(self, menu_index: int, mask: int) -> Decimal:
+        return self.item_price(menu_index) + self.modifier_cost(mask)
+
+    def line_price(self, order_line: OrderLine) -> Decimal:
+        if not order_line.available:
+            return ZERO
+        mask = encode_modifications(order_line.modifications)
+        return self.unit_price(order_line.menu_index, mask) * order_line.quantity
+
+    def add_to_total(self, order_total: Optional[Text], order_lines: Iterable[OrderLine]) -> Text:
+        total = Decimal(order_total) if order_total else ZERO
+        for order_line in order_lines:
+            total += self.line_price(order_line)
+        return str(total)
+
+    def quote(self, order_lines: Iterable[OrderLine]) -> Quote:
+        return self._quote(basket_signature(order_lines))
+
+    def _evaluate(self, signature: BasketSignature) -> Quote:
+        subtotal = sum((self.unit_price(menu_index, mask) * quantity for menu_index, mask, quantity in signature), ZERO)
+        quantity = sum(quantity for _, _, quantity in signature)
+
+        discount = ZERO
+        applied = []
+        for rule in self.discounts:
+            if quantity < rule.get("min_quantity", 0) or subtotal < to_amount(rule.get("min_subtotal", 0)):
+                continue
+            if "percent" in rule:
+                discount += subtotal * Decimal(str(rule["percent"])) / 100
+            discount += to_amount(rule.get("amount", 0))
+            applied.append(rule.get("name", ""))
+        discount = min(discount, subtotal).quantize(CENT, rounding=ROUND_HALF_UP)
+
+        net = subtotal - discount
+        if self.tax_included:
+            tax = (net - net / (1 + self.tax_rate)).quantize(CENT, rounding=ROUND_HALF_UP)
+            total = net
+        else:
+            tax = (net * self.tax_rate).quantize(CENT, rounding=ROUND_HALF_UP)
+            total = net + tax
+        return Quote(subtotal, discount, tax, total, tuple(applied))
+
+    def format(self, amount: Union[Decimal, Text]) -> Text:
+        return f"{amount} {self.currency}".rstrip()
+
+
+def basket_signature(order_lines: Iterable[OrderLine]) -> BasketSignature:
+    # The same basket in any line order, or with a line repeated instead of its quantity raised, prices the same.
+    quantities: Counter = Counter()
+    for order_line in order_lines:
+        if order_line.available:
+            quantities[(order_line.menu_index, encode_modifications(order_line.modifications))] += order_line.quantity
+    return tuple(sorted((menu_index, mask, quantity) for (menu_index, mask), quantity in quantities.items()))
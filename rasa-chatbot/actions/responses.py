@@ -0,0 +1,87 @@
+from functools import lru_cache
+from string import Formatter
+from typing import Any, Dict, List, Optional, Text
+
+from rasa_sdk.executor import CollectingDispatcher
+
+from . import settings
+
+MESSAGE_SEPARATOR = "\n\n"
+
+
+# Rendering is plain str.format; what is worked out once is the set of placeholders, which tells the batching
+# dispatcher whether a response got all its values, and whether there are any at all: a template without
+# placeholders renders to its own text without formatting.
+class Template:
+    __slots__ = ("text", "fields", "render")
+
+    def __init__(self, text: Text):
+        self.text = text
+        self.fields = frozenset(field for _, field, _, _ in Formatter().parse(text) if field is not None)
+        self.render = text.format if self.fields else self._constant
+
+    def _constant(self, *args: Any, **kwargs: Any) -> Text:
+        return self.text
+
+    def __repr__(self) -> Text:
+        return f"Template({self.text!r})"
+
+
+@lru_cache(maxsize=1024)
+def response_template(text: Text) -> Template:
+    return Template(text)
+
+
+def domain_template(domain: Dict[Text, Any], name: Optional[Text]) -> Optional[Template]:
+    # Read from the domain Rasa sends with every request, so responses always match the trained model; templates
+    # are cached by their text. Only responses Rasa would render the same way every time can be rendered here: one
+    # variation, text only. Anything with variations, buttons, images, conditions or per-channel texts is still sent
+    # by name.
+    variations = (domain.get("responses") or {}).get(name) if name else None
+    if isinstance(variations, list) and len(variations) == 1 and set(variations[0]) == {"text"}:
+        return response_template(variations[0]["text"])
+    return None
+
+
+# Collects a turn's plain text messages, including domain responses whose values were all passed in, and hands
+# them to the real dispatcher as one message. Any other message flushes what has been collected first, so the
+# order the user sees is unchanged.
+class BatchingDispatcher(CollectingDispatcher):
+    def __init__(self, dispatcher: CollectingDispatcher, domain: Dict[Text, Any]):
+        self.dispatcher = dispatcher
+        self.domain = domain
+        self.pending: List[Text] = []
+
+    @property
+    def messages(self) -> List[Dict[Text, Any]]:
+        return self.dispatcher.messages
+
+    def utter_message(self, text: Optional[Text] = None, image: Optional[Text] = None,
+                      json_message: Optional[Dict[Text, Any]] = None, template: Optional[Text] = None,
+                      response: Optional[Text] = None, attachment: Optional[Text] = None,
+                      buttons: Optional[List[Dict[Text, Any]]] = None,
+                      elements: Optional[List[Dict[Text, Any]]] = None, **kwargs: Any) -> None:
+        if not (image or json_message or template or attachment or buttons or elements):
+            if text is not None and response is None and not kwargs:
+                self.pending.append(text)
+                return
+            compiled = domain_template(self.domain, response) if text is None else None
+            if compiled is not None and compiled.fields.issubset(kwargs):
+                self.pending.append(compiled.render(**kwargs))
+                return
+
+        self.flush()
+        self.dispatcher.utter_message(text, image, json_message, template, response, attachment, buttons, elements,
+                                      **kwargs)
+
+    def flush(self) -> None:
+        if self.pending:
+            self.dispatcher.utter_message(text=MESSAGE_SEPARATOR.join(self.pending))
+            self.pending = []
+
+
+def batch_for(dispatcher: CollectingDispatcher, input_channel: Optional[Text],
+              domain: Dict[Text, Any]) -> Optional[BatchingDispatcher]:
+    if input_channel not in settings.BATCHED_CHANNELS:
+        return None
+    return BatchingDispatcher(dispatcher, domain or {})
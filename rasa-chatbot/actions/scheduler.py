@@ -0,0 +1,114 @@
+import argparse
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from . import settings
+from .opening_hours import OpeningHoursIndex
+
+
+class KitchenSlot(NamedTuple):
+    order_id: int
+    station: int
+    start: datetime
+    ready: datetime
+
+
+# Stations live in a min-heap keyed by the time they become free, so placing an order is a single heapreplace.
+# Accepted orders sit in a second heap keyed by their ready time and are dropped once they are done.
+class KitchenScheduler:
+    def __init__(self, stations: int = settings.KITCHEN_STATIONS):
+        if stations < 1:
+            raise ValueError("KitchenScheduler needs at least one station")
+        self._lock = threading.Lock()
+        self._stations: List[Tuple[datetime, int]] = [(datetime.min, station) for station in range(stations)]
+        self._accepted: List[Tuple[datetime, int]] = []
+        self._order_ids = itertools.count(1)
+
+    def schedule(self, now: datetime, preparation_time: timedelta,
+                 opening_hours_index: Optional[OpeningHoursIndex] = None) -> Optional[KitchenSlot]:
+        with self._lock:
+            self._release(now)
+            free_at, station = self._stations[0]
+            start = max(now, free_at)
+            ready = start + preparation_time
+
+            if opening_hours_index is not None:
+                closing_time = opening_hours_index.next_closing(now)
+                if closing_time is not None and ready > closing_time:
+                    return None
+
+            heapq.heapreplace(self._stations, (ready, station))
+            slot = KitchenSlot(next(self._order_ids), station, start, ready)
+            heapq.heappush(self._accepted, (ready, slot.order_id))
+            return slot
+
+    def earliest_start(self, now: datetime) -> datetime:
+        with self._lock:
+            return max(now, self._stations[0][0])
+
+    def pending_orders(self, now: datetime) -> int:
+        with self._lock:
+            self._release(now)
+            return len(self._accepted)
+
+    def _release(self, now: datetime) -> None:
+        while self._accepted and self._accepted[0][0] <= now:
+            heapq.heappop(self._accepted)
+
+
+def simulate(arrivals: Iterable[Tuple[datetime, timedelta]], opening_hours_index: OpeningHoursIndex,
+             stations: int = settings.KITCHEN_STATIONS) -> List[Optional[KitchenSlot]]:
+    scheduler = KitchenScheduler(stations)
+    slots = []
+    for arrival, preparation_time in arrivals:
+        if not opening_hours_index.is_open(arrival):
+            slots.append(None)
+            continue
+        slots.append(scheduler.schedule(arrival, preparation_time, opening_hours_index))
+    return slots
+
+
+def synthetic_day(day: datetime, orders: int, preparation_times: List[float],
+                  rng: random.Random) -> List[Tuple[datetime, timedelta]]:
+    start = day.replace(hour=0, minute=0, second=0, microsecond=0)
+    return sorted((start + timedelta(seconds=rng.uniform(0, 24 * 3600)), timedelta(hours=rng.choice(preparation_times)))
+                  for _ in range(orders))
+
+
+def main():
+    from .data_store import DataStore
+
+    parser = argparse.ArgumentParser(description="Replay a day of orders against the kitchen scheduler.")
+    parser.add_argument("--date", default=datetime.now().strftime("%Y-%m-%d"), help="day to simulate, YYYY-MM-DD")
+    parser.add_argument("--orders", type=int, default=500)
+    parser.add_argument("--stations", type=int, default=settings.KITCHEN_STATIONS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--opening-hours", default=os.path.join(settings.DATA_DIR, "opening_hours.json"))
+    parser.add_argument("--menu", default=os.path.join(settings.DATA_DIR, "menu.json"))
+    args = parser.parse_args()
+
+    snapshot = DataStore(args.opening_hours, args.menu).snapshot()
+    arrivals = synthetic_day(datetime.strptime(args.date, "%Y-%m-%d"), args.orders,
+                             list(snapshot.menu_catalog.preparation_times), random.Random(args.seed))
+
+    started = time.perf_counter()
+    slots = simulate(arrivals, snapshot.opening_hours_index, args.stations)
+    elapsed = time.perf_counter() - started
+
+    accepted = [slot for slot in slots if slot is not None]
+    waits = sorted((slot.start - arrival).total_seconds() / 60
+                   for slot, (arrival, _) in zip(slots, arrivals) if slot is not None)
+    print(f"Simulated {len(slots)} orders on {args.stations} stations in {elapsed * 1000:.1f} ms")
+    print(f"Accepted {len(accepted)}, rejected {len(slots) - len(accepted)}")
+    if waits:
+        print(f"Queue wait: median {waits[len(waits) // 2]:.1f} min, max {waits[-1]:.1f} min")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import os
+
+
+def env_flag(name, default=False):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def env_channels(name, default=""):
+    return frozenset(channel.strip() for channel in os.environ.get(name, default).split(",") if channel.strip())
+
+
+ASYNC_ACTIONS = env_flag("ACTIONS_ASYNC")
+EXECUTOR_WORKERS = int(os.environ.get("ACTIONS_EXECUTOR_WORKERS", "8"))
+EXECUTOR_MAX_PENDING = int(os.environ.get("ACTIONS_EXECUTOR_MAX_PENDING", "256"))
+
+METRICS_ENABLED = env_flag("ACTIONS_METRICS")
+METRICS_PORT = int(os.environ.get("ACTIONS_METRICS_PORT", "9464"))
+
+KITCHEN_STATIONS = int(os.environ.get("ACTIONS_KITCHEN_STATIONS", "2"))
+# ISO date and time the actions use instead of the current time, so benchmark runs take the same branches every day.
+FIXED_TIME = os.environ.get("ACTIONS_FIXED_TIME") or None
+
+# Resolved once, so the data is found regardless of the working directory the action server was started from.
+DATA_DIR = os.path.abspath(os.environ.get("ACTIONS_DATA_DIR")
+                           or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"))
+DATA_SNAPSHOT_PATH = os.environ.get("ACTIONS_DATA_SNAPSHOT") or None
+
+LOCATIONS_DIR = os.environ.get("ACTIONS_LOCATIONS_DIR", os.path.join(DATA_DIR, "locations"))
+MAX_TENANTS = int(os.environ.get("ACTIONS_MAX_TENANTS", "128"))
+
+# Channels whose clients render the menu from a custom JSON payload; every other channel gets it as text.
+JSON_MENU_CHANNELS = env_channels("ACTIONS_JSON_MENU_CHANNELS")
+
+# Channels whose clients show one multi-paragraph message as well as several short ones; a turn's text messages are
+# sent to them as a single message.
+BATCHED_CHANNELS = env_channels("ACTIONS_BATCHED_CHANNELS", "rest,socketio,telegram,twilio")
+
+ADDRESS_CACHE_SIZE = int(os.environ.get("ACTIONS_ADDRESS_CACHE_SIZE", "4096"))
+ADDRESS_CACHE_TTL = float(os.environ.get("ACTIONS_ADDRESS_CACHE_TTL", "3600"))
@@ -0,0 +1,294 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping, Sequence
+from typing import Any, Callable, Dict, Iterator, Optional, Text, Tuple
+
+from . import settings
+from .fuzzy_match import FuzzyMatcher
+from .menu import MenuCatalog, normalize_name
+
+# Layout, all little-endian:
+#   header | item records | hash slots | string table
+# Item records are fixed width. Strings (names, joined aliases, per-item JSON for any other fields and the opening
+# hours document) live in the string table and are referenced by (offset, length). The hash index maps normalised
+# names and aliases to item positions with linear probing over FNV-1a hashes, so lookups never build the dicts.
+# The header's spare field holds the most words in any name or alias, which bounds MenuCatalog.resolve.
+MAGIC = b"RMSN"
+SNAPSHOT_FORMAT_VERSION = 2
+
+HEADER = struct.Struct("<4sHHIIIIIII")
+ITEM_RECORD = struct.Struct("<IIIIIIIdd")
+HASH_SLOT = struct.Struct("<III")
+
+RECORD_FIELDS = ("id", "name", "aliases", "price", "preparation_time")
+ALIAS_SEPARATOR = "\x1f"
+EMPTY_SLOT = 0xFFFFFFFF
+
+
+def fnv1a(data: bytes) -> int:
+    value = 0x811C9DC5
+    for byte in data:
+        value = ((value ^ byte) * 0x01000193) & 0xFFFFFFFF
+    return value
+
+
+class StringTable:
+    def __init__(self):
+        self.buffer = bytearray()
+        self._offsets: Dict[bytes, int] = {}
+
+    def add(self, text: Text):
+        data = text.encode("utf-8")
+        offset = self._offsets.get(data)
+        if offset is None:
+            offset = self._offsets[data] = len(self.buffer)
+            self.buffer.extend(data)
+        return offset, len(data)
+
+
+def compile_snapshot(opening_hours_path: Text, menu_path: Text, output_path: Text) -> int:
+    with open(opening_hours_path, "r") as file:
+        hours_document = json.load(file)
+    with open(menu_path, "r") as file:
+        menu_items = json.load(file).get('items', [])
+
+    strings = StringTable()
+    records = bytearray()
+    keys = []
+    for index, item in enumerate(menu_items):
+        name_offset, name_length = strings.add(item["name"])
+        aliases_offset, aliases_length = strings.add(ALIAS_SEPARATOR.join(item.get("aliases", [])))
+        extra = {key: value for key, value in item.items() if key not in RECORD_FIELDS}
+        extra_offset, extra_length = strings.add(json.dumps(extra) if extra else "")
+        # Prices may be written as strings ("7.5"), which the pricing code accepts; the record stores them as numbers.
+        records.extend(ITEM_RECORD.pack(item.get("id", index + 1), name_offset, name_length, aliases_offset,
+                                        aliases_length, extra_offset, extra_length, float(item["price"]),
+                                        float(item["preparation_time"])))
+        keys.append((normalize_name(item["name"]), index))
+        keys.extend((normalize_name(alias), index) for alias in item.get("aliases", []))
+
+    slot_count = 1
+    while slot_count < 2 * len(keys):
+        slot_count *= 2
+    slots = [(EMPTY_SLOT, 0, 0)] * slot_count
+    for key, index in keys:
+        encoded = key.encode("utf-8")
+        position = fnv1a(encoded) & (slot_count - 1)
+        while slots[position][0] != EMPTY_SLOT:
+            _, occupied_offset, occupied_length = slots[position]
+            if strings.buffer[occupied_offset:occupied_offset + occupied_length] == encoded:
+                break
+            position = (position + 1) & (slot_count - 1)
+        else:
+            slots[position] = (index,) + strings.add(key)
+    hash_table = b"".join(HASH_SLOT.pack(key_offset, key_length, index) for index, key_offset, key_length in slots)
+
+    hours_offset, hours_length = strings.add(json.dumps(hours_document))
+    max_words = max((len(key.split()) for key, _ in keys), default=0)
+
+    items_offset = HEADER.size
+    hash_offset = items_offset + len(records)
+    strings_offset = hash_offset + len(hash_table)
+    header = HEADER.pack(MAGIC, SNAPSHOT_FORMAT_VERSION, max_words, len(menu_items), slot_count, items_offset,
+                         hash_offset, strings_offset, hours_offset, hours_length)
+
+    # Written next to the target and renamed into place: readers that still map the old file keep a valid view.
+    temporary_path = f"{output_path}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(header)
+        file.write(records)
+        file.write(hash_table)
+        file.write(strings.buffer)
+    os.replace(temporary_path, output_path)
+    return len(menu_items)
+
+
+class SnapshotFile:
+    def __init__(self, path: Text):
+        self.path = path
+        with open(path, "rb") as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._buffer) < HEADER.size:
+            raise ValueError(f"{path} is not a data snapshot")
+        (magic, version, self.max_name_words, self.item_count, self._slot_count, self._items_offset, self._hash_offset,
+         self._strings_offset, self._hours_offset, self._hours_length) = HEADER.unpack_from(self._buffer)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a data snapshot")
+        if version != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"{path} has snapshot format {version}, expected {SNAPSHOT_FORMAT_VERSION}")
+        if (self._items_offset + self.item_count * ITEM_RECORD.size > self._hash_offset
+                or self._hash_offset + self._slot_count * HASH_SLOT.size > self._strings_offset
+                or self._strings_offset + self._hours_offset + self._hours_length > len(self._buffer)):
+            raise ValueError(f"{path} is truncated")
+
+        self.items = MenuItemsView(self)
+
+    def string(self, offset: int, length: int) -> Text:
+        start = self._strings_offset + offset
+        return self._buffer[start:start + length].decode("utf-8")
+
+    def record(self, index: int):
+        if index < 0:
+            index += self.item_count
+        if not 0 <= index < self.item_count:
+            raise IndexError(index)
+        return ITEM_RECORD.unpack_from(self._buffer, self._items_offset + index * ITEM_RECORD.size)
+
+    def find(self, name: Text) -> Optional[int]:
+        if not self._slot_count:
+            return None
+        encoded = normalize_name(name).encode("utf-8")
+        position = fnv1a(encoded) & (self._slot_count - 1)
+        while True:
+            key_offset, key_length, index = HASH_SLOT.unpack_from(self._buffer,
+                                                                  self._hash_offset + position * HASH_SLOT.size)
+            if index == EMPTY_SLOT:
+                return None
+            start = self._strings_offset + key_offset
+            if key_length == len(encoded) and self._buffer[start:start + key_length] == encoded:
+                return index
+            position = (position + 1) & (self._slot_count - 1)
+
+    def keys(self) -> Iterator[Tuple[Text, int]]:
+        for position in range(self._slot_count):
+            key_offset, key_length, index = HASH_SLOT.unpack_from(self._buffer,
+                                                                  self._hash_offset + position * HASH_SLOT.size)
+            if index != EMPTY_SLOT:
+                yield self.string(key_offset, key_length), index
+
+    def opening_hours_document(self) -> Dict[Text, Any]:
+        return json.loads(self.string(self._hours_offset, self._hours_length))
+
+    def close(self) -> None:
+        self._buffer.close()
+
+
+class MenuItemsView(Sequence):
+    def __init__(self, snapshot_file: SnapshotFile):
+        self._file = snapshot_file
+
+    def __len__(self) -> int:
+        return self._file.item_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return MenuItemView(self._file, index)
+
+
+class MenuItemView(Mapping):
+    def __init__(self, snapshot_file: SnapshotFile, index: int):
+        self._file = snapshot_file
+        self._record = snapshot_file.record(index)
+        self._extra: Optional[Dict[Text, Any]] = None
+
+    def _extra_fields(self) -> Dict[Text, Any]:
+        if self._extra is None:
+            extra_offset, extra_length = self._record[5], self._record[6]
+            self._extra = json.loads(self._file.string(extra_offset, extra_length)) if extra_length else {}
+        return self._extra
+
+    def __getitem__(self, key: Text) -> Any:
+        _, _, _, aliases_offset, aliases_length, _, _, _, _ = self._record
+        if key == "aliases" and aliases_length:
+            return self._file.string(aliases_offset, aliases_length).split(ALIAS_SEPARATOR)
+        read = RECORD_READERS.get(key)
+        if read is not None:
+            return read(self._file, self._record)
+        return self._extra_fields()[key]
+
+    def __iter__(self) -> Iterator[Text]:
+        # Items without aliases had no "aliases" key in the source file, so the view does not report one either.
+        yield from (field for field in RECORD_FIELDS if field != "aliases" or self._record[4])
+        yield from self._extra_fields()
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+def _number(value: float):
+    return int(value) if value.is_integer() else value
+
+
+RECORD_READERS: Dict[Text, Callable[[SnapshotFile, tuple], Any]] = {
+    "id": lambda snapshot_file, record: record[0],
+    "name": lambda snapshot_file, record: snapshot_file.string(record[1], record[2]),
+    "price": lambda snapshot_file, record: _number(record[7]),
+    "preparation_time": lambda snapshot_file, record: _number(record[8]),
+}
+
+
+class RecordColumn(Sequence):
+    def __init__(self, snapshot_file: SnapshotFile, field: Text):
+        self._file = snapshot_file
+        self._read = RECORD_READERS[field]
+
+    def __len__(self) -> int:
+        return self._file.item_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        return self._read(self._file, self._file.record(index))
+
+
+# A MenuCatalog that reads straight from the mapped file: columns unpack one record per access, exact lookups go
+# through the file's hash index, and the id index, fuzzy matcher and rendered menus are only built when first used.
+# Loading a snapshot therefore costs the same for any menu size.
+class MappedMenuCatalog(MenuCatalog):
+    def __init__(self, snapshot_file: SnapshotFile):
+        self._file = snapshot_file
+        self.items = snapshot_file.items
+        self.names = RecordColumn(snapshot_file, "name")
+        self.prices = RecordColumn(snapshot_file, "price")
+        self.preparation_times = RecordColumn(snapshot_file, "preparation_time")
+        self.ids = RecordColumn(snapshot_file, "id")
+        self._max_alias_words = snapshot_file.max_name_words
+        self._id_index: Optional[Dict[int, int]] = None
+        self._fuzzy_matcher: Optional[FuzzyMatcher] = None
+        self._rendered: Dict[Text, Any] = {}
+
+    def find(self, name: Text) -> Optional[int]:
+        return self._file.find(name)
+
+    def find_fuzzy(self, name: Text) -> Optional[int]:
+        index = self._file.find(name)
+        if index is not None:
+            return index
+        if self._fuzzy_matcher is None:
+            self._fuzzy_matcher = FuzzyMatcher(dict(self._file.keys()))
+        return self._fuzzy_matcher.match(normalize_name(name))
+
+    def find_by_id(self, item_id: int) -> Optional[int]:
+        if self._id_index is None:
+            self._id_index = {record_id: index for index, record_id in enumerate(self.ids)}
+        return self._id_index.get(item_id)
+
+    def resolve(self, text: Text) -> Optional[int]:
+        words = normalize_name(text).split()
+        for length in range(min(len(words), self._max_alias_words), 0, -1):
+            index = self._file.find(" ".join(words[:length]))
+            if index is not None:
+                return index
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the menu and opening hours into a binary data snapshot.")
+    parser.add_argument("--opening-hours", default=os.path.join(settings.DATA_DIR, "opening_hours.json"))
+    parser.add_argument("--menu", default=os.path.join(settings.DATA_DIR, "menu.json"))
+    parser.add_argument("-o", "--output", default=os.path.join(settings.DATA_DIR, "snapshot.bin"))
+    args = parser.parse_args()
+
+    count = compile_snapshot(args.opening_hours, args.menu, args.output)
+    print(f"Wrote {count} menu items to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional, Text
+
+from rasa_sdk import Tracker
+
+from . import metrics, settings
+from .data_store import DataSnapshot, DataStore
+from .delivery_zones import DeliveryZones
+from .scheduler import KitchenScheduler
+from .tenants import TenantRegistry, location_id_for
+
+logger = logging.getLogger(__name__)
+
+# Nothing here runs at import time: the data files are read, the watcher thread started and the metrics server
+# bound the first time an action asks for data, so importing the action modules stays cheap.
+_lock = threading.Lock()
+_data_store: Optional[DataStore] = None
+_tenants: Optional[TenantRegistry] = None
+_kitchen_schedulers: Dict[Any, KitchenScheduler] = {}
+_delivery_zones: Optional[DeliveryZones] = None
+_configured_time = datetime.fromisoformat(settings.FIXED_TIME) if settings.FIXED_TIME else None
+_fixed_time = _configured_time
+
+
+def now() -> datetime:
+    return _fixed_time if _fixed_time is not None else datetime.now()
+
+
+def set_clock(moment: Optional[datetime]) -> None:
+    # Replays pin the clock to each recorded turn's time; None goes back to ACTIONS_FIXED_TIME or the real clock.
+    global _fixed_time
+    _fixed_time = moment if moment is not None else _configured_time
+
+
+def data_path(file_name: Text) -> Text:
+    return os.path.join(settings.DATA_DIR, file_name)
+
+
+def get_data_store() -> DataStore:
+    global _data_store
+    if _data_store is None:
+        with _lock:
+            if _data_store is None:
+                data_store = DataStore(data_path("opening_hours.json"), data_path("menu.json"),
+                                       snapshot_path=settings.DATA_SNAPSHOT_PATH,
+                                       pricing_path=data_path("pricing.json"))
+                data_store.start_watching()
+                _data_store = data_store
+                if metrics.ENABLED:
+                    _start_metrics_server()
+    return _data_store
+
+
+def _start_metrics_server() -> None:
+    # Several workers on one host share the port and only the first binds it; the others keep serving actions.
+    from .metrics_server import start_metrics_server
+    try:
+        start_metrics_server(port=settings.METRICS_PORT)
+    except OSError as error:
+        logger.warning("Not serving action metrics on port %d: %s", settings.METRICS_PORT, error)
+
+
+def get_tenants() -> TenantRegistry:
+    global _tenants
+    if _tenants is None:
+        data_store = get_data_store()
+        with _lock:
+            if _tenants is None:
+                _tenants = TenantRegistry(data_store)
+    return _tenants
+
+
+def snapshot_for(tracker: Tracker) -> DataSnapshot:
+    return get_tenants().snapshot(location_id_for(tracker))
+
+
+def kitchen_scheduler_for(location_id: Optional[Text]) -> KitchenScheduler:
+    # Kitchen queues outlive tenant data evictions: accepted orders must not be forgotten. Location ids come from
+    # client metadata, so only locations that exist get their own queue; anything else shares the base kitchen.
+    if not get_tenants().has_location(location_id):
+        location_id = None
+    kitchen_scheduler = _kitchen_schedulers.get(location_id)
+    if kitchen_scheduler is None:
+        kitchen_scheduler = _kitchen_schedulers.setdefault(location_id, KitchenScheduler())
+    return kitchen_scheduler
+
+
+def reset_kitchen_schedulers() -> None:
+    _kitchen_schedulers.clear()
+
+
+def get_delivery_zones() -> DeliveryZones:
+    global _delivery_zones
+    if _delivery_zones is None:
+        with _lock:
+            if _delivery_zones is None:
+                _delivery_zones = DeliveryZones(data_path("delivery_zones.geojson"), data_path("gazetteer.json"),
+                                                cache_size=settings.ADDRESS_CACHE_SIZE, ttl=settings.ADDRESS_CACHE_TTL)
+    return _delivery_zones
@@ -0,0 +1,117 @@
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Text
+
+from rasa_sdk import Tracker
+
+from . import settings
+from .data_store import DATA_FILE_ERRORS, DataSnapshot, DataStore
+
+logger = logging.getLogger(__name__)
+
+LOCATION_SLOT = "location_id"
+LOCATION_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def location_id_for(tracker: Tracker) -> Optional[Text]:
+    location_id = tracker.get_slot(LOCATION_SLOT)
+    if location_id is None:
+        location_id = (tracker.latest_message.get("metadata") or {}).get(LOCATION_SLOT)
+    return str(location_id) if location_id is not None else None
+
+
+# Each location lives in <locations_dir>/<location_id>/ with optional opening_hours.json, menu.json and pricing.json;
+# whatever is missing falls back to the base store and is shared with it, and unknown locations are served the base
+# data. Loaded locations are kept in an LRU of bounded size, and their files are re-checked on access instead of by
+# a watcher thread per location.
+class TenantRegistry:
+    def __init__(self, base: DataStore, locations_dir: Text = settings.LOCATIONS_DIR,
+                 max_tenants: int = settings.MAX_TENANTS):
+        self.base = base
+        self.locations_dir = locations_dir
+        self.max_tenants = max_tenants
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._tenants: "OrderedDict[Text, Optional[DataStore]]" = OrderedDict()
+        self._checked_at: Dict[Text, float] = {}
+
+    def snapshot(self, location_id: Optional[Text] = None) -> DataSnapshot:
+        if not location_id or not LOCATION_ID_PATTERN.match(location_id):
+            return self.base.snapshot()
+
+        with self._lock:
+            loaded = location_id in self._tenants
+            store = self._tenants.get(location_id)
+            if loaded:
+                self._tenants.move_to_end(location_id)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if not loaded:
+            store = self._load(location_id)
+            with self._lock:
+                store = self._tenants.setdefault(location_id, store)
+                self._checked_at[location_id] = time.monotonic()
+                while len(self._tenants) > self.max_tenants:
+                    evicted, _ = self._tenants.popitem(last=False)
+                    self._checked_at.pop(evicted, None)
+                    self.evictions += 1
+        elif time.monotonic() - self._checked_at.get(location_id, 0) > self.base.poll_interval:
+            self._checked_at[location_id] = time.monotonic()
+            if store is not None:
+                try:
+                    store.check_for_changes()
+                except DATA_FILE_ERRORS as error:
+                    logger.warning("Keeping the loaded data for location %s, checking it failed: %s",
+                                   location_id, error)
+            else:
+                # Locations without data (or with broken data) are retried, so new shards show up without a restart.
+                store = self._load(location_id)
+                if store is not None:
+                    with self._lock:
+                        if location_id in self._tenants:
+                            self._tenants[location_id] = store
+
+        return store.snapshot() if store is not None else self.base.snapshot()
+
+    def _load(self, location_id: Text) -> Optional[DataStore]:
+        directory = os.path.join(self.locations_dir, location_id)
+        if not os.path.isdir(directory):
+            return None
+
+        opening_hours_path = os.path.join(directory, "opening_hours.json")
+        menu_path = os.path.join(directory, "menu.json")
+        pricing_path = os.path.join(directory, "pricing.json")
+        opening_hours_path = opening_hours_path if os.path.isfile(opening_hours_path) else None
+        menu_path = menu_path if os.path.isfile(menu_path) else None
+        pricing_path = pricing_path if os.path.isfile(pricing_path) else None
+        if opening_hours_path is None and menu_path is None and pricing_path is None:
+            return None
+        try:
+            return DataStore(opening_hours_path, menu_path, self.base.poll_interval, base=self.base,
+                             pricing_path=pricing_path)
+        except DATA_FILE_ERRORS as error:
+            logger.warning("Serving base data for location %s, loading it failed: %s", location_id, error)
+            return None
+
+    def has_location(self, location_id: Optional[Text]) -> bool:
+        return bool(location_id and LOCATION_ID_PATTERN.match(location_id)
+                    and os.path.isdir(os.path.join(self.locations_dir, location_id)))
+
+    def stats(self) -> Dict[Text, Any]:
+        with self._lock:
+            return {
+                "loaded": len(self._tenants),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,331 @@
+import argparse
+import inspect
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from ruamel.yaml import YAML
+
+from errors_generator import tagged_typo_variants
+from nlu_augmentation import parse_annotated_example, read_nlu_examples
+
+ORDER_SLOT_FIXTURE = ["1:2:1:0", "1:4:1:10000", "1:6:2:0"]
+ACTIONS_READING_ORDER = {"action_confirm_order", "action_confirm_pickup_time", "action_confirm_delivery_time"}
+DELIVERY_SLOT_FIXTURE = {"address": "Grodzka 24", "delivery_zone": "old-town"}
+# A Monday lunchtime: the restaurant is open, so time-dependent actions measure their ordering branch.
+DEFAULT_CLOCK = "2026-10-19T12:00:00"
+
+
+def read_yaml(path):
+    with open(path, "r") as file:
+        return YAML(typ="safe").load(file) or {}
+
+
+def story_action_intents(stories_path):
+    stories = read_yaml(stories_path).get("stories", [])
+
+    intents_by_action = defaultdict(set)
+    for story in stories:
+        intent = None
+        for step in story.get("steps", []):
+            if "intent" in step:
+                intent = step["intent"]
+            elif step.get("action", "").startswith("action_") and intent:
+                intents_by_action[step["action"]].add(intent)
+    return intents_by_action
+
+
+def entities_from_tags(chars, tags, annotations):
+    entities = []
+    start = None
+    for position, tag in enumerate(tags + [None]):
+        if start is not None and (position == len(tags) or tag != tags[start]):
+            annotation = annotations[tags[start]]
+            if annotation.startswith("("):
+                entity = annotation[1:-1].split(":")[0]
+            else:
+                entity = json.loads(annotation).get("entity")
+            entities.append({"entity": entity, "value": "".join(chars[start:position]),
+                             "start": start, "end": position})
+            start = None
+        if start is None and tag is not None:
+            start = position
+    return entities
+
+
+def build_scenarios(nlu_path, stories_path, noise_variants=0, seed=0):
+    intents_by_action = story_action_intents(stories_path)
+    examples_by_intent = defaultdict(list)
+    rng = random.Random(seed)
+
+    for intent, example in read_nlu_examples(nlu_path):
+        chars, tags, annotations = parse_annotated_example(example)
+        variants = [(chars, tags)]
+        if noise_variants:
+            variants.extend((list(text), typo_tags)
+                            for text, typo_tags in tagged_typo_variants(chars, tags, noise_variants, rng))
+        for variant_chars, variant_tags in variants:
+            examples_by_intent[intent].append({
+                "text": "".join(variant_chars),
+                "intent": {"name": intent, "confidence": 1.0},
+                "entities": entities_from_tags(variant_chars, variant_tags, annotations),
+            })
+
+    scenarios = defaultdict(list)
+    for action_name, intents in intents_by_action.items():
+        slots = {"current_order": list(ORDER_SLOT_FIXTURE)} if action_name in ACTIONS_READING_ORDER else {}
+        if action_name == "action_confirm_delivery_time":
+            slots.update(DELIVERY_SLOT_FIXTURE)
+        for intent in sorted(intents):
+            for message in examples_by_intent.get(intent, []):
+                scenarios[action_name].append((message, slots))
+    return scenarios
+
+
+def tracker_state(sender_id, message, slots, input_channel=None):
+    # The input channel is only known from the user event, which is where Tracker.get_latest_input_channel reads it.
+    events = []
+    if input_channel is not None:
+        events.append({"event": "user", "text": message.get("text"), "input_channel": input_channel,
+                       "parse_data": {"intent": message.get("intent", {}), "entities": message.get("entities", [])}})
+    return {
+        "sender_id": sender_id,
+        "slots": json.loads(json.dumps(slots)),
+        "latest_message": message,
+        "events": events,
+        "paused": False,
+        "followup_action": None,
+        "active_loop": {},
+        "latest_action_name": None,
+    }
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def summarize(latencies, elapsed, allocations=None):
+    latencies = sorted(latencies)
+    summary = {
+        "runs": len(latencies),
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "requests_per_second": len(latencies) / elapsed if elapsed else None,
+    }
+    if allocations:
+        summary["peak_alloc_bytes"] = statistics.mean(size for size, _ in allocations)
+        summary["alloc_blocks"] = statistics.mean(blocks for _, blocks in allocations)
+    return summary
+
+
+def load_domain(domain_path):
+    # Rasa sends the domain with every request; the actions render batched domain responses from it.
+    return read_yaml(domain_path)
+
+
+def load_actions():
+    from actions import actions as action_module
+    from actions.base import SyncActionBase
+
+    registry = {}
+    for value in vars(action_module).values():
+        if inspect.isclass(value) and issubclass(value, SyncActionBase):
+            action = value()
+            registry[action.name()] = action
+    return registry
+
+
+def run_in_process(scenarios, iterations, allocation_samples, domain):
+    import asyncio
+
+    from rasa_sdk import Tracker
+    from rasa_sdk.executor import CollectingDispatcher
+
+    from actions.state import reset_kitchen_schedulers
+
+    registry = load_actions()
+    results = {}
+
+    def invoke(action, message, slots, index):
+        tracker = Tracker.from_dict(tracker_state(f"benchmark-{index}", message, slots))
+        events = action.run(CollectingDispatcher(), tracker, domain)
+        if inspect.isawaitable(events):
+            asyncio.run(events)
+
+    for action_name, cases in sorted(scenarios.items()):
+        action = registry.get(action_name)
+        if action is None or not cases:
+            continue
+
+        latencies = []
+        started = time.perf_counter()
+        for index in range(iterations):
+            message, slots = cases[index % len(cases)]
+            # Every case starts from an empty kitchen, or later runs would measure the "past closing time" branch.
+            reset_kitchen_schedulers()
+            call_started = time.perf_counter()
+            invoke(action, message, slots, index)
+            latencies.append(time.perf_counter() - call_started)
+        elapsed = time.perf_counter() - started
+
+        allocations = []
+        tracemalloc.start()
+        for index in range(allocation_samples):
+            message, slots = cases[index % len(cases)]
+            reset_kitchen_schedulers()
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+            baseline, _ = tracemalloc.get_traced_memory()
+            invoke(action, message, slots, index)
+            _, peak = tracemalloc.get_traced_memory()
+            blocks = sum(stat.count_diff for stat in tracemalloc.take_snapshot().compare_to(before, "filename")
+                         if stat.count_diff > 0)
+            allocations.append((peak - baseline, blocks))
+        tracemalloc.stop()
+
+        results[action_name] = summarize(latencies, elapsed, allocations)
+    return results
+
+
+def endpoint_url(endpoints_path):
+    return read_yaml(endpoints_path)["action_endpoint"]["url"]
+
+
+def wait_for_server(url, timeout):
+    health_url = url.rsplit("/", 1)[0] + "/health"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(health_url, timeout=1):
+                return
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.25)
+    raise RuntimeError(f"Action server did not become healthy at {health_url}")
+
+
+def run_against_server(scenarios, iterations, url, domain, concurrency):
+    def post(action_name, message, slots, index):
+        payload = {
+            "next_action": action_name,
+            "sender_id": f"benchmark-{index}",
+            "tracker": tracker_state(f"benchmark-{index}", message, slots),
+            "domain": domain,
+            "version": "3.1",
+        }
+        request = urllib.request.Request(url, json.dumps(payload).encode("utf-8"),
+                                         {"Content-Type": "application/json"})
+        started = time.perf_counter()
+        with urllib.request.urlopen(request) as response:
+            response.read()
+        return time.perf_counter() - started
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for action_name, cases in sorted(scenarios.items()):
+            if not cases:
+                continue
+            started = time.perf_counter()
+            futures = [pool.submit(post, action_name, *cases[index % len(cases)], index) for index in range(iterations)]
+            latencies = [future.result() for future in futures]
+            results[action_name] = summarize(latencies, time.perf_counter() - started)
+    return results
+
+
+def compare(results, baseline_path, tolerance):
+    with open(baseline_path, "r") as file:
+        baseline = json.load(file)["actions"]
+
+    regressions = []
+    for action_name, summary in results.items():
+        previous = baseline.get(action_name)
+        if not previous:
+            continue
+        change = summary["p50_ms"] / previous["p50_ms"] - 1 if previous["p50_ms"] else 0.0
+        marker = "REGRESSION" if change > tolerance else ""
+        print(f"{action_name:<45} p50 {previous['p50_ms']:8.3f} -> {summary['p50_ms']:8.3f} ms "
+              f"({change:+.1%}) {marker}")
+        if marker:
+            regressions.append(action_name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the custom actions with synthetic conversations.")
+    parser.add_argument("--nlu", default="data/nlu.yml")
+    parser.add_argument("--stories", default="data/stories.yml")
+    parser.add_argument("--domain", default="domain.yml")
+    parser.add_argument("--endpoints", default="endpoints.yml")
+    parser.add_argument("--mode", choices=["in-process", "server"], default="in-process")
+    parser.add_argument("--start-server", action="store_true", help="start `rasa run actions` for server mode")
+    parser.add_argument("--iterations", type=int, default=2000, help="runs per action")
+    parser.add_argument("--allocation-samples", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--noise-variants", type=int, default=0, help="typo variants added per NLU example")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="JSON results path")
+    parser.add_argument("--baseline", default=None, help="previous JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p50 slowdown before flagging")
+    parser.add_argument("--clock", default=DEFAULT_CLOCK,
+                        help="ISO time the actions see as now; an action server started elsewhere needs "
+                             "ACTIONS_FIXED_TIME set to the same value")
+    args = parser.parse_args()
+
+    # Set before the actions are imported, and inherited by a server started with --start-server.
+    os.environ["ACTIONS_FIXED_TIME"] = args.clock
+
+    scenarios = build_scenarios(args.nlu, args.stories, args.noise_variants, args.seed)
+    domain = load_domain(args.domain)
+
+    server = None
+    try:
+        if args.mode == "server":
+            url = endpoint_url(args.endpoints)
+            if args.start_server:
+                port = url.split(":")[-1].split("/")[0]
+                server = subprocess.Popen(["rasa", "run", "actions", "--port", port])
+            wait_for_server(url, timeout=60)
+            results = run_against_server(scenarios, args.iterations, url, domain, args.concurrency)
+        else:
+            results = run_in_process(scenarios, args.iterations, args.allocation_samples, domain)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "mode": args.mode,
+        "python": platform.python_version(),
+        "iterations": args.iterations,
+        "noise_variants": args.noise_variants,
+        "clock": args.clock,
+        "actions": results,
+    }
+    output = args.output or f"benchmarks/results/{args.mode}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2)
+
+    for action_name, summary in results.items():
+        print(f"{action_name:<45} p50 {summary['p50_ms']:8.3f} ms  p99 {summary['p99_ms']:8.3f} ms  "
+              f"{summary['requests_per_second']:10.1f} req/s")
+    print(f"Results written to {output}")
+
+    if args.baseline and compare(results, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
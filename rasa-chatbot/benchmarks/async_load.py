@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+def entities_for(text, *pairs):
+    entities = []
+    for value, entity in pairs:
+        start = text.index(value)
+        entities.append({"entity": entity, "value": value, "start": start, "end": start + len(value)})
+    return entities
+
+
+def build_scenarios():
+    multiple_items = "I would like to order Pizza, Burger and Tiramisu"
+    additional_request = "I want to order Burger without Onions and Pizza with extra Cheese"
+    return [
+        ("action_check_is_open", "is the restaurant open on Monday at 9?",
+         [{"entity": "day", "value": "Monday"}, {"entity": "time", "value": "9"}], {}),
+        ("action_get_opening_hours", "when is the restaurant open on Friday?",
+         [{"entity": "day", "value": "Friday"}], {}),
+        ("action_check_currently_open", "is the restaurant currently open?", [], {}),
+        ("action_list_menu", "can you show me the menu?", [], {}),
+        ("action_place_single_item_order", "I would like to order Lasagne",
+         [{"entity": "food", "value": "Lasagne"}], {}),
+        ("action_place_order_with_multiple_items", multiple_items,
+         entities_for(multiple_items, ("Pizza", "food"), ("Burger", "food"), ("Tiramisu", "food")), {}),
+        ("action_place_order_with_additional_request", additional_request,
+         entities_for(additional_request, ("Burger", "food"), ("without", "modifier"), ("Onions", "ingredient"),
+                      ("Pizza", "food"), ("with extra", "modifier"), ("Cheese", "ingredient")), {}),
+        ("action_confirm_order", "no", [], {"current_order": ["Pizza", "Burger"]}),
+        ("action_confirm_address", "my delivery address is Grodzka 24",
+         [{"entity": "address", "value": "Grodzka 24"}], {}),
+        ("action_confirm_pickup_time", "no", [], {"current_order": ["Pizza", "Burger"]}),
+    ]
+
+
+async def run_worker(conversations, concurrency):
+    from rasa_sdk import Tracker
+    from rasa_sdk.executor import CollectingDispatcher
+
+    from actions.base import ActionBase
+    from benchmarks.action_benchmark import load_actions
+
+    registry = load_actions()
+
+    scenarios = build_scenarios()
+    slots = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def converse(index):
+        action_name, text, entities, slot_values = scenarios[index % len(scenarios)]
+        tracker = Tracker(f"benchmark-{index}", dict(slot_values), {"text": text, "entities": entities},
+                          [], False, None, {}, None)
+        async with slots:
+            started = time.perf_counter()
+            events = registry[action_name].run(CollectingDispatcher(), tracker, {})
+            if inspect.isawaitable(events):
+                await events
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(converse(index) for index in range(conversations)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "async": ActionBase.__name__ == "AsyncActionBase",
+        "conversations": conversations,
+        "concurrency": concurrency,
+        "elapsed_seconds": elapsed,
+        "requests_per_second": conversations / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def run_mode(mode, conversations, concurrency):
+    env = dict(os.environ, ACTIONS_ASYNC="true" if mode == "async" else "false")
+    command = [sys.executable, "-m", "benchmarks.async_load", "--worker",
+               "--conversations", str(conversations), "--concurrency", str(concurrency)]
+    output = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load benchmark for sync and async action execution.")
+    parser.add_argument("--conversations", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=1000)
+    parser.add_argument("--modes", nargs="+", choices=["sync", "async"], default=["sync", "async"])
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(asyncio.run(run_worker(args.conversations, args.concurrency))))
+        return
+
+    for mode in args.modes:
+        result = run_mode(mode, args.conversations, args.concurrency)
+        print(f"{mode:>5}: {result['requests_per_second']:10.1f} req/s  "
+              f"p50 {result['p50_ms']:8.3f} ms  p99 {result['p99_ms']:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
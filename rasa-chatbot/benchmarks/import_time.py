@@ -0,0 +1,63 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Runs in a fresh interpreter: rasa_sdk (and the standard modules it always pulls in) is imported first so only the
+# project's own modules are timed, and the lazy data layer is checked to still be untouched once every action module
+# has been imported.
+PROBE = """
+import json, logging, os, time, typing
+import rasa_sdk, rasa_sdk.events, rasa_sdk.executor
+opened = []
+real_open = open
+def tracking_open(file, *args, **kwargs):
+    opened.append(str(file))
+    return real_open(file, *args, **kwargs)
+import builtins
+builtins.open = tracking_open
+started = time.perf_counter()
+import actions.actions
+elapsed = time.perf_counter() - started
+builtins.open = real_open
+from actions import state
+print(json.dumps({"seconds": elapsed, "opened": opened, "data_loaded": state._data_store is not None}))
+"""
+
+
+def measure_once(cwd):
+    output = subprocess.run([sys.executable, "-c", PROBE], cwd=cwd, check=True, capture_output=True, text=True,
+                            env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that importing the actions package stays within budget.")
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="allowed median import time")
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--cwd", default="/", help="directory to import from; data paths must not depend on it")
+    args = parser.parse_args()
+
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    os.environ["PYTHONPATH"] = os.pathsep.join(filter(None, [project_dir, os.environ.get("PYTHONPATH")]))
+
+    results = [measure_once(args.cwd) for _ in range(args.runs)]
+    median_ms = statistics.median(result["seconds"] for result in results) * 1000
+    print(f"import actions.actions: median {median_ms:.1f} ms over {args.runs} runs (budget {args.budget_ms:.1f} ms)")
+
+    failures = []
+    if median_ms > args.budget_ms:
+        failures.append("import time is over budget")
+    if any(result["opened"] for result in results):
+        failures.append(f"files opened during import: {results[0]['opened']}")
+    if any(result["data_loaded"] for result in results):
+        failures.append("data store was created during import")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import sys
+import time
+from collections import Counter, OrderedDict, deque
+from datetime import datetime
+from multiprocessing import Pool
+from typing import Any, Dict, List, NamedTuple, Optional, Text
+
+from benchmarks.action_benchmark import load_actions, load_domain, tracker_state
+from nlu_augmentation import chunked
+
+# benchmarks/fixtures/offline_eval_sample.jsonl holds turns recorded from the current actions on a server in
+# Europe/Warsaw; replaying it with --timezone Europe/Warsaw has to report zero differences (exit status 0), which
+# checks the comparison itself rather than the actions.
+RESET_EVENTS = {"restart", "session_started"}
+TURN_BOUNDARY_EVENTS = {"action", "user"} | RESET_EVENTS
+
+
+def recorded_message(event):
+    utter_action = (event.get("metadata") or {}).get("utter_action")
+    if utter_action:
+        return f"response:{utter_action}"
+    # CollectingDispatcher stores "custom": {} on every message, so only a non-empty payload marks a custom one.
+    custom = (event.get("data") or {}).get("custom")
+    if custom:
+        return json.dumps(custom, sort_keys=True)
+    return event.get("text")
+
+
+def emitted_message(message):
+    if message.get("response"):
+        return f"response:{message['response']}"
+    if message.get("custom"):
+        return json.dumps(message["custom"], sort_keys=True)
+    return message.get("text")
+
+
+class Turn(NamedTuple):
+    sender_id: Text
+    action_name: Text
+    timestamp: Optional[float]
+    slots: Dict[Text, Any]
+    latest_message: Dict[Text, Any]
+    input_channel: Optional[Text]
+    messages: List[Any]
+    slot_sets: List[List[Any]]
+
+
+class ConversationState:
+    def __init__(self):
+        self.slots = {}
+        self.latest_message = {}
+        self.input_channel = None
+        self.pending = None
+
+    def reset(self):
+        self.slots = {}
+        self.latest_message = {}
+        self.input_channel = None
+
+
+# Tracker stores log an ActionExecuted event and then the events the action returned, so a custom action's turn
+# is the action event plus every bot and slot event up to the next action, user message or restart. Only the most
+# recently active conversations are kept in memory; exports are grouped by sender or by time, so a conversation
+# that has gone quiet for max_conversations others is finished.
+def read_turns(paths, action_names, max_conversations=100_000):
+    conversations = OrderedDict()
+    for path in paths:
+        with open(path, "r") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                sender_id = event.get("sender_id", "")
+                state = conversations.get(sender_id)
+                if state is None:
+                    state = conversations[sender_id] = ConversationState()
+                    if len(conversations) > max_conversations:
+                        _, finished = conversations.popitem(last=False)
+                        if finished.pending is not None:
+                            yield finished.pending
+                else:
+                    conversations.move_to_end(sender_id)
+
+                kind = event.get("event")
+                if kind in TURN_BOUNDARY_EVENTS and state.pending is not None:
+                    yield state.pending
+                    state.pending = None
+
+                if kind == "action" and event.get("name") in action_names:
+                    state.pending = Turn(sender_id, event["name"], event.get("timestamp"), dict(state.slots),
+                                         state.latest_message, state.input_channel, [], [])
+                elif kind == "user":
+                    state.latest_message = {
+                        "text": event.get("text"),
+                        "intent": (event.get("parse_data") or {}).get("intent", {}),
+                        "entities": (event.get("parse_data") or {}).get("entities", []),
+                        "metadata": event.get("metadata") or {},
+                    }
+                    state.input_channel = event.get("input_channel")
+                elif kind == "bot" and state.pending is not None:
+                    state.pending.messages.append(recorded_message(event))
+                elif kind == "slot":
+                    if state.pending is not None:
+                        state.pending.slot_sets.append([event.get("name"), event.get("value")])
+                    state.slots[event.get("name")] = event.get("value")
+                elif kind in RESET_EVENTS:
+                    state.reset()
+
+    for state in conversations.values():
+        if state.pending is not None:
+            yield state.pending
+
+
+_registry = None
+
+
+def get_registry():
+    global _registry
+    if _registry is None:
+        _registry = load_actions()
+    return _registry
+
+
+def turn_time(timestamp, timezone):
+    if timestamp is None:
+        return None
+    if timezone is None:
+        return datetime.fromtimestamp(timestamp)
+    from zoneinfo import ZoneInfo
+    return datetime.fromtimestamp(timestamp, ZoneInfo(timezone)).replace(tzinfo=None)
+
+
+def evaluate_chunk(turns, domain, timezone=None):
+    from rasa_sdk import Tracker
+    from rasa_sdk.executor import CollectingDispatcher
+
+    from actions.state import reset_kitchen_schedulers, set_clock
+
+    registry = get_registry()
+    counts = Counter()
+    mismatches = []
+    for sender_id, action_name, timestamp, slots, latest_message, input_channel, expected_messages, expected_slots \
+            in turns:
+        # Each turn runs at the time it was recorded and against an empty kitchen: the queue it met was filled by
+        # other conversations' orders, which a replay spread over workers cannot reproduce.
+        set_clock(turn_time(timestamp, timezone))
+        reset_kitchen_schedulers()
+        dispatcher = CollectingDispatcher()
+        tracker = Tracker.from_dict(tracker_state(sender_id, latest_message, slots, input_channel))
+        try:
+            events = registry[action_name].run(dispatcher, tracker, domain)
+            if inspect.isawaitable(events):
+                events = asyncio.run(events)
+        except Exception as error:
+            counts[(action_name, "error")] += 1
+            mismatches.append({"sender_id": sender_id, "action": action_name, "error": repr(error)})
+            continue
+
+        messages = [emitted_message(message) for message in dispatcher.messages]
+        slot_sets = [[event.get("name"), event.get("value")] for event in events or [] if event.get("event") == "slot"]
+        counts[(action_name, "turns")] += 1
+        if messages != expected_messages or slot_sets != expected_slots:
+            counts[(action_name, "mismatches")] += 1
+            mismatches.append({
+                "sender_id": sender_id,
+                "action": action_name,
+                "text": latest_message.get("text"),
+                "expected": {"messages": expected_messages, "slots": expected_slots},
+                "actual": {"messages": messages, "slots": slot_sets},
+            })
+    return counts, mismatches
+
+
+def evaluate(paths, report_path, domain, workers=None, chunk_size=512, actions=None, max_conversations=100_000,
+             timezone=None):
+    workers = workers or os.cpu_count() or 1
+    action_names = set(actions or get_registry())
+    counts = Counter()
+
+    with open(report_path, "w") as report, Pool(workers) as pool:
+        def collect(result):
+            chunk_counts, mismatches = result
+            counts.update(chunk_counts)
+            for mismatch in mismatches:
+                report.write(json.dumps(mismatch) + "\n")
+
+        # Same bounded window as the NLU augmentation: reading never runs far ahead of the workers.
+        pending = deque()
+        for chunk in chunked(read_turns(paths, action_names, max_conversations), chunk_size):
+            pending.append(pool.apply_async(evaluate_chunk, (chunk, domain, timezone)))
+            if len(pending) >= workers * 2:
+                collect(pending.popleft().get())
+        while pending:
+            collect(pending.popleft().get())
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay exported tracker events through the actions and diff "
+                                                 "the messages and slot events against the recorded ones.")
+    parser.add_argument("events", nargs="+", help="JSONL files with one tracker event (including sender_id) per line")
+    parser.add_argument("-o", "--report", default="offline_eval_mismatches.jsonl")
+    parser.add_argument("--domain", default="domain.yml", help="domain the recorded turns were served with")
+    parser.add_argument("--timezone", default=None,
+                        help="time zone of the server that recorded the events (default: this machine's)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=512)
+    parser.add_argument("--actions", nargs="+", default=None, help="only replay these actions")
+    parser.add_argument("--max-conversations", type=int, default=100_000,
+                        help="conversations kept in memory while reading")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    counts = evaluate(args.events, args.report, load_domain(args.domain), args.workers, args.chunk_size, args.actions,
+                      args.max_conversations, args.timezone)
+    elapsed = time.perf_counter() - started
+
+    total_turns = sum(count for (_, kind), count in counts.items() if kind == "turns")
+    total_failures = sum(count for (_, kind), count in counts.items() if kind != "turns")
+    for action_name in sorted({action_name for action_name, _ in counts}):
+        print(f"{action_name:<45} turns {counts[(action_name, 'turns')]:>9}  "
+              f"mismatches {counts[(action_name, 'mismatches')]:>7}  errors {counts[(action_name, 'error')]:>5}")
+    print(f"Replayed {total_turns} turns in {elapsed:.1f} s ({total_turns / elapsed if elapsed else 0:.0f} turns/s), "
+          f"{total_failures} differences written to {args.report}")
+    sys.exit(1 if total_failures else 0)
+
+
+if __name__ == "__main__":
+    main()
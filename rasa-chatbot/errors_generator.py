@@ -1,116 +1,148 @@
 import random
 
+from keyboard_layouts import AliasTable, load_layout
 
-def substitution_error(word):
-    nearby_chars = {
-        'a': 'qwsz',
-        'b': 'vghn',
-        'c': 'xdfv',
-        'd': 'erfcxs',
-        'e': 'rdsw',
-        'f': 'rtgvcd',
-        'g': 'tyhbvf',
-        'h': 'yujnbg',
-        'i': 'uojk',
-        'j': 'uikmnh',
-        'k': 'iojlm',
-        'l': 'kop',
-        'm': 'njk',
-        'n': 'bhjm',
-        'o': 'iklp',
-        'p': 'ol',
-        'q': 'wa',
-        'r': 'etdf',
-        's': 'awedcxz',
-        't': 'ryfgh',
-        'u': 'yihj',
-        'v': 'cfgb',
-        'w': 'qase',
-        'x': 'zsdc',
-        'y': 'tghu',
-        'z': 'asx'
-    }
-
-    new_word = list(word)
-    substitution_done = False
-    while not substitution_done:
-        i = random.randint(0, len(word)-1)
-        char = word[i]
-        if char in nearby_chars:
-            new_char = random.choice(nearby_chars[char])
-            if new_char != char:
-                new_word[i] = new_char
-                substitution_done = True
-    return ''.join(new_word)
-
-
-def omission_error(word):
-    if len(word) > 1:
-        index = random.randint(0, len(word) - 1)
-        word = word[:index] + word[index + 1:]
-    return word
-
-
-def insertion_error(word):
-    index = random.randint(0, len(word))
-    char = random.choice('abcdefghijklmnopqrstuvwxyz')
-    word = word[:index] + char + word[index:]
-    return word
-
-
-def reversal_error(word):
-    if len(word) > 1:
-        index1 = random.randint(0, len(word) - 2)
-        index2 = index1 + 1
-        char1 = word[index1]
-        char2 = word[index2]
-        word = word[:index1] + char2 + char1 + word[index2 + 1:]
-    return word
-
-
-def double_typing_error(word):
-    if len(word) > 0:
-        index = random.randint(0, len(word) - 1)
-        word = word[:index] + word[index] + word[index:]
-    return word
-
-
-def spacing_error(sentence):
-    index = random.randint(0, len(sentence))
-    if random.choice([True, False]):
-        sentence = sentence[:index] + ' ' + sentence[index:]
-    else:
-        if index < len(sentence) and sentence[index] == ' ':
-            sentence = sentence[:index] + sentence[index + 1:]
-    return sentence
-
-
-def generate_random_error():
-    error_functions = [substitution_error, omission_error, insertion_error, reversal_error,
-                       double_typing_error, spacing_error]
-    return random.choice(error_functions)
 
+LETTERS = 'abcdefghijklmnopqrstuvwxyz'
 
-def generate_typos(sentence):
-    generated_sentences = []
+
+# The char edits below work on a list of characters plus a parallel list of tags (e.g. entity ids),
+# keeping every tagged run contiguous and non-empty so annotations survive the edit.
+def _inserted_tag(tags, i):
+    if 0 < i < len(tags) and tags[i - 1] == tags[i]:
+        return tags[i]
+    return None
+
+
+def _is_last_of_tag(tags, i):
+    tag = tags[i]
+    if tag is None:
+        return False
+    return (i == 0 or tags[i - 1] != tag) and (i == len(tags) - 1 or tags[i + 1] != tag)
+
+
+def substitute_chars(chars, tags, rng, layout):
+    start = rng.randrange(len(chars))
+    for offset in range(len(chars)):
+        i = (start + offset) % len(chars)
+        neighbour = layout.sample_neighbour(chars[i], rng)
+        if neighbour:
+            chars[i] = neighbour
+            return
+
+
+def omit_char(chars, tags, rng, layout):
+    if len(chars) > 1:
+        i = rng.randrange(len(chars))
+        if not _is_last_of_tag(tags, i):
+            del chars[i]
+            del tags[i]
+
+
+def insert_char(chars, tags, rng, layout):
+    i = rng.randint(0, len(chars))
+    chars.insert(i, rng.choice(LETTERS))
+    tags.insert(i, _inserted_tag(tags, i))
+
+
+def reverse_chars(chars, tags, rng, layout):
+    if len(chars) > 1:
+        i = rng.randrange(len(chars) - 1)
+        if tags[i] == tags[i + 1]:
+            chars[i], chars[i + 1] = chars[i + 1], chars[i]
+
+
+def double_char(chars, tags, rng, layout):
+    if chars:
+        i = rng.randrange(len(chars))
+        chars.insert(i, chars[i])
+        tags.insert(i, tags[i])
+
+
+def change_spacing(chars, tags, rng, layout):
+    i = rng.randint(0, len(chars))
+    if rng.random() < 0.5:
+        chars.insert(i, ' ')
+        tags.insert(i, _inserted_tag(tags, i))
+    elif i < len(chars) and chars[i] == ' ' and not _is_last_of_tag(tags, i):
+        del chars[i]
+        del tags[i]
+
+
+CHAR_EDITS = {
+    "substitution": substitute_chars,
+    "omission": omit_char,
+    "insertion": insert_char,
+    "reversal": reverse_chars,
+    "double_typing": double_char,
+    "spacing": change_spacing,
+}
+DEFAULT_ERROR_WEIGHTS = {name: 1.0 for name in CHAR_EDITS}
+
+
+class TypoModel:
+    def __init__(self, layout="qwerty", error_weights=None):
+        unknown = set(error_weights or {}) - set(CHAR_EDITS)
+        if unknown:
+            raise ValueError(f"Unknown error types: {', '.join(sorted(unknown))}")
+        weights = dict(DEFAULT_ERROR_WEIGHTS, **(error_weights or {}))
+        names = [name for name in CHAR_EDITS if weights[name] > 0]
+
+        self.layout = load_layout(layout)
+        self.error_weights = {name: weights[name] for name in names}
+        self._edits = AliasTable([CHAR_EDITS[name] for name in names], [weights[name] for name in names])
+
+    def apply_random_edit(self, chars, tags, rng):
+        self._edits.sample(rng)(chars, tags, rng, self.layout)
+
+
+DEFAULT_MODEL = TypoModel()
+
+
+def tagged_typo_variants(chars, tags, variants, rng, error_rate=0.1, max_attempts=None, model=DEFAULT_MODEL):
+    sentence = ''.join(chars)
     num_words = len(sentence.split())
-    average_typos = round(num_words / 10)
-
-    while len(generated_sentences) < 10:
-        typo_sentence = sentence
-        num_typos = random.randint(max(1, average_typos - 2), min(average_typos + 2, num_words))
-        for _ in range(num_typos):
-            error_function = generate_random_error()
-            typo_sentence = error_function(typo_sentence)
-        if typo_sentence != sentence and typo_sentence not in generated_sentences:
-            generated_sentences.append(typo_sentence)
-
-    return generated_sentences
-
-
-original_sentence = "can I go to the restaurant at this moment?"
-typos = generate_typos(original_sentence)
-print("Original sentence:", original_sentence)
-print("Typos:")
-for typo in typos:
-    print("- " + typo)
+    average_typos = round(num_words * error_rate)
+    min_typos = max(1, average_typos - 2)
+    max_typos = max(min_typos, min(average_typos + 2, num_words))
+    if max_attempts is None:
+        max_attempts = variants * 20
+
+    generated = {}
+    attempts = 0
+    while len(generated) < variants and attempts < max_attempts and chars:
+        attempts += 1
+        new_chars, new_tags = list(chars), list(tags)
+        for _ in range(rng.randint(min_typos, max_typos)):
+            model.apply_random_edit(new_chars, new_tags, rng)
+        typo_sentence = ''.join(new_chars)
+        if typo_sentence != sentence:
+            generated.setdefault(typo_sentence, new_tags)
+
+    return list(generated.items())
+
+
+def typo_variants(sentence, variants, rng, error_rate=0.1, max_attempts=None, model=DEFAULT_MODEL):
+    variants = tagged_typo_variants(list(sentence), [None] * len(sentence), variants, rng, error_rate, max_attempts,
+                                    model)
+    return [typo_sentence for typo_sentence, _ in variants]
+
+
+def generate_typos_batch(corpus, variants=10, error_rate=0.1, seed=None, max_attempts=None, layout="qwerty",
+                         error_weights=None):
+    rng = random.Random(seed)
+    model = DEFAULT_MODEL if layout == "qwerty" and not error_weights else TypoModel(layout, error_weights)
+    return [typo_variants(sentence, variants, rng, error_rate, max_attempts, model) for sentence in corpus]
+
+
+def generate_typos(sentence):
+    return generate_typos_batch([sentence])[0]
+
+
+if __name__ == "__main__":
+    original_sentence = "can I go to the restaurant at this moment?"
+    typos = generate_typos(original_sentence)
+    print("Original sentence:", original_sentence)
+    print("Typos:")
+    for typo in typos:
+        print("- " + typo)
@@ -0,0 +1,96 @@
+import json
+import os
+
+LAYOUTS = {
+    "qwerty": ["qwertyuiop", "asdfghjkl", "zxcvbnm"],
+    "azerty": ["azertyuiop", "qsdfghjklm", "wxcvbn"],
+    "qwertz": ["qwertzuiop", "asdfghjkl", "yxcvbnm"],
+}
+
+# Horizontal stagger of each row, in key widths, as on a standard keyboard.
+ROW_OFFSETS = [0.0, 0.25, 0.75]
+
+SAME_ROW_WEIGHT = 2.0
+ADJACENT_ROW_WEIGHT = 1.0
+
+
+class AliasTable:
+    def __init__(self, outcomes, weights):
+        if not outcomes or len(outcomes) != len(weights):
+            raise ValueError("AliasTable needs one positive weight per outcome")
+        total = float(sum(weights))
+        if total <= 0:
+            raise ValueError("AliasTable needs at least one positive weight")
+
+        size = len(outcomes)
+        scaled = [weight * size / total for weight in weights]
+        self.outcomes = list(outcomes)
+        self.probabilities = [1.0] * size
+        self.aliases = list(range(size))
+
+        small = [i for i, weight in enumerate(scaled) if weight < 1.0]
+        large = [i for i, weight in enumerate(scaled) if weight >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probabilities[less] = scaled[less]
+            self.aliases[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+
+    def sample(self, rng):
+        position = rng.random() * len(self.outcomes)
+        i = int(position)
+        if position - i < self.probabilities[i]:
+            return self.outcomes[i]
+        return self.outcomes[self.aliases[i]]
+
+
+class KeyboardLayout:
+    def __init__(self, rows, row_offsets=None, name="custom"):
+        self.name = name
+        self.rows = [row.lower() for row in rows]
+        row_offsets = row_offsets or ROW_OFFSETS
+        positions = {}
+        for row_index, row in enumerate(self.rows):
+            offset = row_offsets[row_index] if row_index < len(row_offsets) else row_offsets[-1]
+            for column, key in enumerate(row):
+                positions[key] = (row_index, column + offset)
+
+        self.neighbours = {}
+        self._tables = {}
+        for key, (row, column) in positions.items():
+            neighbours, weights = [], []
+            for other, (other_row, other_column) in positions.items():
+                if other == key:
+                    continue
+                if other_row == row and abs(other_column - column) == 1:
+                    neighbours.append(other)
+                    weights.append(SAME_ROW_WEIGHT)
+                elif abs(other_row - row) == 1 and abs(other_column - column) <= 1:
+                    neighbours.append(other)
+                    weights.append(ADJACENT_ROW_WEIGHT)
+            if neighbours:
+                self.neighbours[key] = "".join(neighbours)
+                self._tables[key] = AliasTable(neighbours, weights)
+
+    def has_neighbours(self, char):
+        return char.lower() in self._tables
+
+    def sample_neighbour(self, char, rng):
+        table = self._tables.get(char.lower())
+        if table is None:
+            return None
+        neighbour = table.sample(rng)
+        return neighbour.upper() if char.isupper() else neighbour
+
+
+def load_layout(layout):
+    if isinstance(layout, KeyboardLayout):
+        return layout
+    if layout in LAYOUTS:
+        return KeyboardLayout(LAYOUTS[layout], name=layout)
+    if os.path.isfile(layout):
+        with open(layout, "r") as file:
+            data = json.load(file)
+        return KeyboardLayout(data["rows"], data.get("row_offsets"), data.get("name", layout))
+    raise ValueError(f"Unknown keyboard layout: {layout}")
@@ -0,0 +1,170 @@
+import argparse
+import os
+import random
+import re
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
+
+from errors_generator import TypoModel, tagged_typo_variants
+
+INTENT_PATTERN = re.compile(r"^- intent:\s*(?P<intent>\S+)")
+EXAMPLE_PATTERN = re.compile(r"^\s+- (?P<example>.*)$")
+ANNOTATION_PATTERN = re.compile(r"\[(?P<value>[^\]]+)\](?P<annotation>\([^)]+\)|\{[^}]+\})")
+
+
+def read_nlu_examples(path):
+    intent = None
+    in_examples = False
+    with open(path, "r") as file:
+        for line in file:
+            line = line.rstrip("\n")
+            match = INTENT_PATTERN.match(line)
+            if match:
+                intent, in_examples = match.group("intent"), False
+                continue
+            if line.startswith("- "):
+                intent, in_examples = None, False
+                continue
+            if intent and line.strip().startswith("examples:"):
+                in_examples = True
+                continue
+            if intent and in_examples:
+                match = EXAMPLE_PATTERN.match(line)
+                if match:
+                    yield intent, match.group("example").rstrip()
+
+
+def parse_annotated_example(example):
+    chars, tags, annotations = [], [], []
+    position = 0
+    for match in ANNOTATION_PATTERN.finditer(example):
+        plain = example[position:match.start()]
+        chars.extend(plain)
+        tags.extend([None] * len(plain))
+        chars.extend(match.group("value"))
+        tags.extend([len(annotations)] * len(match.group("value")))
+        annotations.append(match.group("annotation"))
+        position = match.end()
+    chars.extend(example[position:])
+    tags.extend([None] * (len(example) - position))
+    return chars, tags, annotations
+
+
+def render_annotated_example(chars, tags, annotations):
+    parts = []
+    current_tag = None
+    for char, tag in zip(chars, tags):
+        if tag != current_tag:
+            if current_tag is not None:
+                parts.append("]" + annotations[current_tag])
+            if tag is not None:
+                parts.append("[")
+            current_tag = tag
+        parts.append(char)
+    if current_tag is not None:
+        parts.append("]" + annotations[current_tag])
+    return "".join(parts)
+
+
+_models = {}
+
+
+def get_model(layout, error_weights):
+    key = (layout, tuple(sorted((error_weights or {}).items())))
+    if key not in _models:
+        _models[key] = TypoModel(layout, error_weights)
+    return _models[key]
+
+
+def augment_chunk(task):
+    chunk_seed, examples, variants, error_rate, keep_original, layout, error_weights = task
+    rng = random.Random(chunk_seed)
+    model = get_model(layout, error_weights)
+    augmented = []
+    for intent, example in examples:
+        chars, tags, annotations = parse_annotated_example(example)
+        if keep_original:
+            augmented.append((intent, example))
+        for typo_chars, typo_tags in tagged_typo_variants(chars, tags, variants, rng, error_rate,
+                                                             model=model):
+            augmented.append((intent, render_annotated_example(typo_chars, typo_tags, annotations)))
+    return augmented
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def augment_nlu(input_path, output_path, variants=5, error_rate=0.1, seed=0, workers=None, chunk_size=256,
+                keep_original=False, layout="qwerty", error_weights=None):
+    workers = workers or os.cpu_count() or 1
+    get_model(layout, error_weights)
+    tasks = ((seed * 1_000_003 + index, chunk, variants, error_rate, keep_original, layout, error_weights)
+             for index, chunk in enumerate(chunked(read_nlu_examples(input_path), chunk_size)))
+
+    written = 0
+    current_intent = None
+    with open(output_path, "w") as output, Pool(workers) as pool:
+        output.write('version: "3.1"\n\nnlu:\n')
+
+        def write_results(results):
+            nonlocal written, current_intent
+            for intent, example in results:
+                if intent != current_intent:
+                    if current_intent is not None:
+                        output.write("\n")
+                    output.write(f"- intent: {intent}\n  examples: |\n")
+                    current_intent = intent
+                output.write(f"    - {example}\n")
+                written += 1
+
+        # Bounded in-flight window: results are written in input order and the reader never runs far ahead.
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.apply_async(augment_chunk, (task,)))
+            if len(pending) >= workers * 2:
+                write_results(pending.popleft().get())
+        while pending:
+            write_results(pending.popleft().get())
+
+    return written
+
+
+def parse_error_weights(value):
+    weights = {}
+    for pair in value.split(","):
+        name, _, weight = pair.partition("=")
+        weights[name.strip()] = float(weight)
+    return weights
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Augment Rasa NLU training data with keyboard typos.")
+    parser.add_argument("input", nargs="?", default="data/nlu.yml")
+    parser.add_argument("-o", "--output", default="data/nlu_augmented.yml")
+    parser.add_argument("--variants", type=int, default=5, help="typo variants generated per example")
+    parser.add_argument("--error-rate", type=float, default=0.1, help="average typos per word")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=256)
+    # Rasa trains on everything under data/, where nlu.yml already holds the originals.
+    parser.add_argument("--keep-original", action="store_true",
+                        help="also copy the original examples, for an output that replaces the input")
+    parser.add_argument("--layout", default="qwerty", help="qwerty, azerty, qwertz or a JSON layout file")
+    parser.add_argument("--error-weights", type=parse_error_weights, default=None,
+                        help="relative error type weights, e.g. substitution=3,omission=1,spacing=0.5")
+    args = parser.parse_args()
+
+    written = augment_nlu(args.input, args.output, args.variants, args.error_rate, args.seed, args.workers,
+                          args.chunk_size, args.keep_original, args.layout, args.error_weights)
+    print(f"Wrote {written} examples to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
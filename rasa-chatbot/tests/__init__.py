@@ -0,0 +1,9 @@
+import json
+import os
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+def read_data(file_name):
+    with open(os.path.join(DATA_DIR, file_name), "r") as file:
+        return json.load(file)
@@ -0,0 +1,15 @@
+import pytest
+
+from actions.menu import MenuCatalog
+
+from . import read_data
+
+
+@pytest.fixture
+def menu_catalog():
+    return MenuCatalog(read_data("menu.json")["items"])
+
+
+@pytest.fixture
+def pricing_rules():
+    return read_data("pricing.json")
@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+from actions.fuzzy_match import SHORT_NAME_LENGTH, FuzzyMatcher, bounded_edit_distance
+
+ALPHABET = "abcdeilnorst "
+
+
+def osa_distance(source, target):
+    rows = [[0] * (len(target) + 1) for _ in range(len(source) + 1)]
+    for i in range(len(source) + 1):
+        rows[i][0] = i
+    for j in range(len(target) + 1):
+        rows[0][j] = j
+    for i in range(1, len(source) + 1):
+        for j in range(1, len(target) + 1):
+            rows[i][j] = min(rows[i - 1][j] + 1, rows[i][j - 1] + 1,
+                             rows[i - 1][j - 1] + (source[i - 1] != target[j - 1]))
+            if i > 1 and j > 1 and source[i - 1] == target[j - 2] and source[i - 2] == target[j - 1]:
+                rows[i][j] = min(rows[i][j], rows[i - 2][j - 2] + 1)
+    return rows[-1][-1]
+
+
+def random_word(rng, shortest=1, longest=12):
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(shortest, longest))).strip() or "a"
+
+
+def misspell(rng, word):
+    chars = list(word)
+    for _ in range(rng.randint(0, 3)):
+        position = rng.randrange(len(chars) + 1)
+        edit = rng.randrange(4)
+        if edit == 0 and position < len(chars):
+            chars[position] = rng.choice(ALPHABET)
+        elif edit == 1 and position < len(chars) and len(chars) > 1:
+            del chars[position]
+        elif edit == 2:
+            chars.insert(position, rng.choice(ALPHABET))
+        elif position < len(chars) - 1:
+            chars[position], chars[position + 1] = chars[position + 1], chars[position]
+    return "".join(chars)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_bounded_edit_distance_matches_brute_force(seed):
+    rng = random.Random(seed)
+    for _ in range(1000):
+        source, target = random_word(rng, 0), random_word(rng, 0)
+        max_distance = rng.randint(0, 3)
+        distance = osa_distance(source, target)
+        expected = distance if distance <= max_distance else None
+        assert bounded_edit_distance(source, target, max_distance) == expected, (source, target, max_distance)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_match_finds_a_closest_name_within_the_bound(seed):
+    rng = random.Random(seed)
+    names = {}
+    while len(names) < 150:
+        names.setdefault(random_word(rng), len(names))
+    matcher = FuzzyMatcher(names)
+    name_by_target = {target: name for name, target in names.items()}
+
+    for _ in range(500):
+        query = misspell(rng, rng.choice(list(names))) if rng.random() < 0.8 else random_word(rng)
+        max_distance = 1 if len(query) <= SHORT_NAME_LENGTH else matcher.max_distance
+        best = min(osa_distance(query, name) for name in names)
+
+        target = matcher.match(query)
+        if best > max_distance:
+            assert target is None, query
+        else:
+            assert target is not None, query
+            assert osa_distance(query, name_by_target[target]) == best, query
+
+
+def test_short_typo_sharing_no_trigram_still_matches():
+    # "ba" and "ab" have no padded trigram in common but are one transposition apart.
+    assert FuzzyMatcher({"ab": 7, "tiramisu": 8}).match("ba") == 7
+
+
+def test_menu_typos_resolve_to_menu_items(menu_catalog):
+    assert menu_catalog.names[menu_catalog.find_fuzzy("piza")] == "Pizza"
+    assert menu_catalog.names[menu_catalog.find_fuzzy("Tiramisou")] == "Tiramisu"
+    assert menu_catalog.names[menu_catalog.find_fuzzy("lasagna")] == "Lasagne"
+    assert menu_catalog.find_fuzzy("sushi") is None
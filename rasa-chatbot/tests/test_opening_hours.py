@@ -0,0 +1,95 @@
+import random
+from datetime import datetime, timedelta
+
+from actions.opening_hours import OpeningHoursIndex, parse_time_of_day
+
+# 2026-10-19 is a Monday.
+MONDAY = datetime(2026, 10, 19)
+UNIX_EPOCH = datetime(1970, 1, 1)
+
+HOURS = {
+    "Monday": {"open": 18, "close": 2},
+    "Tuesday": {"shifts": [{"open": "11:30", "close": "14:00"}, {"open": 17, "close": 22}]},
+    "Wednesday": {"open": 8, "close": 20},
+    "Sunday": {"open": 20, "close": 1},
+}
+
+
+def unix_minutes(moment):
+    return (moment - UNIX_EPOCH) // timedelta(minutes=1)
+
+
+def test_parse_time_of_day():
+    assert parse_time_of_day("9") == 9 * 60
+    assert parse_time_of_day("11:30") == 11 * 60 + 30
+    assert parse_time_of_day(0.5) == 30
+
+
+def test_split_shifts():
+    index = OpeningHoursIndex(HOURS)
+    tuesday = MONDAY + timedelta(days=1)
+    assert not index.is_open(tuesday.replace(hour=11, minute=29))
+    assert index.is_open(tuesday.replace(hour=11, minute=30))
+    assert not index.is_open(tuesday.replace(hour=14))
+    assert index.next_opening(tuesday.replace(hour=15)) == tuesday.replace(hour=17)
+    assert index.next_closing(tuesday.replace(hour=12)) == tuesday.replace(hour=14)
+    assert index.day_intervals("Tuesday") == [(690, 840), (1020, 1320)]
+
+
+def test_overnight_shifts_run_into_the_next_day():
+    index = OpeningHoursIndex(HOURS)
+    assert index.is_open(MONDAY.replace(hour=23))
+    assert index.is_open(MONDAY + timedelta(days=1, hours=1, minutes=59))
+    assert not index.is_open(MONDAY + timedelta(days=1, hours=2))
+    assert index.next_closing(MONDAY.replace(hour=19)) == MONDAY + timedelta(days=1, hours=2)
+    # Sunday's shift wraps around the end of the week into Monday morning.
+    assert index.is_open(MONDAY.replace(minute=30))
+    assert not index.is_open(MONDAY.replace(hour=1))
+    assert index.is_open_weekly("Monday", 30)
+
+
+def test_holiday_replaces_the_day():
+    index = OpeningHoursIndex(HOURS, {"2026-10-21": {"shifts": [{"open": 10, "close": 12}]}})
+    wednesday = MONDAY + timedelta(days=2)
+    assert not index.is_open(wednesday.replace(hour=9))
+    assert index.is_open(wednesday.replace(hour=11))
+    assert index.next_opening(wednesday.replace(hour=13)) == wednesday + timedelta(days=4, hours=20)
+    assert index.is_open(wednesday + timedelta(days=7, hours=9))
+
+
+def test_holiday_stops_the_replaced_days_overnight_shift():
+    index = OpeningHoursIndex(HOURS, {"2026-10-19": {"open": 12, "close": 13}})
+    tuesday = MONDAY + timedelta(days=1)
+    assert not index.is_open(tuesday.replace(hour=1))
+    assert index.next_opening(MONDAY.replace(hour=19)) == tuesday.replace(hour=11, minute=30)
+    # The following week is back to the weekly schedule.
+    assert index.is_open(tuesday + timedelta(days=7, hours=1))
+
+
+def test_holiday_without_shifts_closes_the_day():
+    index = OpeningHoursIndex(HOURS, {"2026-10-21": []})
+    wednesday = MONDAY + timedelta(days=2)
+    assert not index.is_open(wednesday.replace(hour=12))
+    assert index.next_opening(wednesday.replace(hour=12)) == wednesday + timedelta(days=4, hours=20)
+
+
+def test_unix_minutes_agree_with_datetimes():
+    index = OpeningHoursIndex(HOURS, {"2026-10-19": {"open": 12, "close": 13}, "2026-12-24": []})
+    rng = random.Random(0)
+    moments = [MONDAY + timedelta(minutes=rng.randrange(-60 * 24 * 30, 60 * 24 * 90)) for _ in range(1000)]
+    minutes = [unix_minutes(moment) for moment in moments]
+
+    assert index.is_open_many(minutes) == index.is_open_many(moments) == [index.is_open(m) for m in moments]
+    assert [index.is_open(minute) for minute in minutes] == index.is_open_many(moments)
+    for moment, minute, opening, closing in zip(moments, minutes, index.next_opening_many(minutes),
+                                                index.next_closing_many(minutes)):
+        assert opening == unix_minutes(index.next_opening(moment))
+        assert closing == unix_minutes(index.next_closing(moment))
+        assert index.next_opening(minute) == opening
+
+
+def test_always_closed():
+    index = OpeningHoursIndex({"Monday": {"open": 0, "close": 0}})
+    assert not index.is_open(MONDAY)
+    assert index.next_opening(MONDAY) is None
+    assert index.next_closing(MONDAY) == MONDAY
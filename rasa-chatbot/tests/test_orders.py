@@ -0,0 +1,79 @@
+from actions.order_codec import decode_order, decode_order_entry, encode_order_line
+from actions.order_parser import Modification, OrderLine, parse_order
+
+
+def message(text, *pairs):
+    entities = []
+    cursor = 0
+    for value, entity in pairs:
+        start = text.index(value, cursor)
+        cursor = start + len(value)
+        entities.append({"entity": entity, "value": value, "start": start, "end": cursor})
+    return {"text": text, "entities": entities}
+
+
+def test_single_item(menu_catalog):
+    parsed = parse_order(message("I would like to order Lasagne", ("Lasagne", "food")), menu_catalog)
+    assert parsed.lines == [OrderLine("Lasagne", 0, 1, ())]
+    assert parsed.missing_count == 0
+
+
+def test_quantities_typos_and_unknown_items(menu_catalog):
+    text = "two pizzas, 3 x Burger and a sushi"
+    parsed = parse_order(message(text, ("pizzas", "food"), ("Burger", "food"), ("sushi", "food")), menu_catalog)
+    assert [(line.item, line.quantity) for line in parsed.lines] == [("Pizza", 2), ("Burger", 3), ("sushi", 1)]
+    assert [line.item for line in parsed.available_lines] == ["Pizza", "Burger"]
+    assert parsed.missing_count == 1
+
+
+def test_unrecognized_parts_are_counted(menu_catalog):
+    parsed = parse_order(message("Pizza, a unicorn and Tiramisu", ("Pizza", "food"), ("Tiramisu", "food")),
+                         menu_catalog)
+    assert [line.item for line in parsed.lines] == ["Pizza", "Tiramisu"]
+    assert parsed.unrecognized == 1
+
+
+def test_modifications_attach_to_the_preceding_item(menu_catalog):
+    text = "Burger without Onions and Pizza with extra Cheese"
+    parsed = parse_order(message(text, ("Burger", "food"), ("without", "modifier"), ("Onions", "ingredient"),
+                                 ("Pizza", "food"), ("with extra", "modifier"), ("Cheese", "ingredient")),
+                         menu_catalog)
+    assert [line.modifications for line in parsed.lines] == [(Modification("without", "Onions"),),
+                                                             (Modification("with extra", "Cheese"),)]
+    assert parsed.lines[1].describe() == "Pizza with extra Cheese"
+    assert parsed.rejected_modifications == []
+
+
+def test_unknown_ingredients_are_rejected(menu_catalog):
+    text = "Pizza with pineapple"
+    parsed = parse_order(message(text, ("Pizza", "food"), ("with", "modifier"), ("pineapple", "ingredient")),
+                         menu_catalog)
+    assert parsed.lines[0].modifications == ()
+    assert parsed.rejected_modifications == [Modification("with", "pineapple")]
+
+
+def test_entities_without_offsets_are_located_in_the_text(menu_catalog):
+    parsed = parse_order({"text": "Pizza and Burger", "entities": [{"entity": "food", "value": "Pizza"},
+                                                                   {"entity": "food", "value": "Burger"}]},
+                         menu_catalog)
+    assert [line.item for line in parsed.lines] == ["Pizza", "Burger"]
+
+
+def test_order_lines_round_trip(menu_catalog):
+    order_line = OrderLine("Burger", 3, 2, (Modification("without", "Onions"), Modification("with extra", "cheese")))
+    entry = encode_order_line(order_line, menu_catalog)
+    assert entry == "1:4:2:110000"
+    decoded = decode_order_entry(entry, menu_catalog)
+    # Ingredients come back with their canonical lowercase names.
+    assert decoded == OrderLine("Burger", 3, 2, (Modification("without", "onions"),
+                                                 Modification("with extra", "cheese")))
+    assert encode_order_line(decoded, menu_catalog) == entry
+
+
+def test_decode_order(menu_catalog):
+    assert decode_order(None, menu_catalog) == []
+    assert decode_order(["1:2:1:0", "1:99:1:0"], menu_catalog) == [OrderLine("Pizza", 1, 1, ())]
+    # Slots written before the compact format hold free-form text.
+    assert decode_order("Pizza with extra cheese, hot dog,", menu_catalog) == [
+        OrderLine("Pizza with extra cheese", 1, 1, ()), OrderLine("hot dog", 2, 1, ())]
+    assert decode_order(["unicorn"], menu_catalog) == [OrderLine("unicorn", None, 1, ())]
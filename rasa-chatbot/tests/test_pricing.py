@@ -0,0 +1,68 @@
+from decimal import Decimal
+
+from actions.order_parser import Modification, OrderLine
+from actions.pricing import PricingEngine, basket_signature, to_amount
+
+PIZZA = OrderLine("Pizza", 1, 1, ())
+BURGER_EXTRA_CHEESE = OrderLine("Burger", 3, 2, (Modification("with extra", "cheese"),))
+MISSING = OrderLine("unicorn", None, 1, ())
+
+
+def test_to_amount_rounds_half_up():
+    assert to_amount(12.5) == Decimal("12.50")
+    assert to_amount("0.125") == Decimal("0.13")
+    assert to_amount(4) == Decimal("4.00")
+
+
+def test_line_prices(menu_catalog, pricing_rules):
+    pricing = PricingEngine(menu_catalog, pricing_rules)
+    assert pricing.line_price(PIZZA) == Decimal("12.00")
+    # (12.50 burger + 1.50 extra cheese) x 2
+    assert pricing.line_price(BURGER_EXTRA_CHEESE) == Decimal("28.00")
+    assert pricing.line_price(MISSING) == Decimal("0")
+    assert pricing.line_price(OrderLine("Pizza", 1, 1, (Modification("with", "onions"),
+                                                        Modification("without", "meat")))) == Decimal("12.50")
+
+
+def test_incremental_total_matches_the_quote(menu_catalog, pricing_rules):
+    pricing = PricingEngine(menu_catalog, pricing_rules)
+    total = pricing.add_to_total(None, [PIZZA])
+    total = pricing.add_to_total(total, [BURGER_EXTRA_CHEESE, MISSING])
+    assert total == "40.00"
+    assert pricing.format(total) == "40.00 EUR"
+    assert pricing.quote([PIZZA, BURGER_EXTRA_CHEESE, MISSING]).subtotal == Decimal(total)
+
+
+def test_tax_included(menu_catalog, pricing_rules):
+    quote = PricingEngine(menu_catalog, pricing_rules).quote([PIZZA])
+    assert quote.total == Decimal("12.00")
+    assert quote.tax == Decimal("0.89")
+    assert quote.discount == Decimal("0") and quote.applied_discounts == ()
+
+
+def test_tax_added(menu_catalog, pricing_rules):
+    quote = PricingEngine(menu_catalog, dict(pricing_rules, tax_included=False)).quote([PIZZA])
+    assert quote.tax == Decimal("0.96")
+    assert quote.total == Decimal("12.96")
+
+
+def test_quantity_discount(menu_catalog, pricing_rules):
+    pricing = PricingEngine(menu_catalog, pricing_rules)
+    assert pricing.quote([PIZZA._replace(quantity=4)]).applied_discounts == ()
+    quote = pricing.quote([PIZZA._replace(quantity=4), OrderLine("Hot-dog", 2, 1, ())])
+    assert quote.subtotal == Decimal("52.00")
+    assert quote.discount == Decimal("5.20")
+    assert quote.total == Decimal("46.80")
+    assert quote.applied_discounts == ("Family order",)
+
+
+def test_basket_signature_ignores_line_order_and_repetition():
+    assert basket_signature([PIZZA, BURGER_EXTRA_CHEESE, PIZZA]) == \
+        basket_signature([BURGER_EXTRA_CHEESE, PIZZA._replace(quantity=2), MISSING])
+
+
+def test_without_rules_prices_are_menu_prices(menu_catalog):
+    pricing = PricingEngine(menu_catalog)
+    quote = pricing.quote([BURGER_EXTRA_CHEESE])
+    assert quote.total == Decimal("25.00") and quote.tax == Decimal("0")
+    assert pricing.format(quote.total) == "25.00"
@@ -0,0 +1,71 @@
+import json
+import os
+
+import pytest
+
+from actions.menu import MenuCatalog
+from actions.snapshot_file import MappedMenuCatalog, SnapshotFile, compile_snapshot
+
+from . import DATA_DIR, read_data
+
+MENU_ITEMS = [
+    {"id": 10, "name": "Margherita Pizza", "aliases": ["margherita", "pizza margherita"], "price": 12,
+     "preparation_time": 0.5, "vegetarian": True},
+    {"id": 11, "name": "Burger", "price": "12.5", "preparation_time": 0.2},
+    {"id": 12, "name": "Żurek", "aliases": ["zurek"], "price": 9.9, "preparation_time": 0.25},
+]
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    menu_path = tmp_path / "menu.json"
+    menu_path.write_text(json.dumps({"items": MENU_ITEMS}))
+    output_path = str(tmp_path / "snapshot.bin")
+    assert compile_snapshot(os.path.join(DATA_DIR, "opening_hours.json"), str(menu_path), output_path) == 3
+    snapshot_file = SnapshotFile(output_path)
+    yield snapshot_file
+    snapshot_file.close()
+
+
+def test_round_trip_matches_menu_catalog(snapshot):
+    menu_items = [dict(item, price=float(item["price"])) for item in MENU_ITEMS]
+    expected = MenuCatalog(menu_items)
+    mapped = MappedMenuCatalog(snapshot)
+
+    assert len(mapped) == len(expected)
+    assert list(mapped.names) == expected.names
+    assert list(mapped.prices) == expected.prices
+    assert list(mapped.preparation_times) == expected.preparation_times
+    assert list(mapped.ids) == expected.ids
+    assert [dict(item) for item in mapped.items] == menu_items
+    assert snapshot.opening_hours_document() == read_data("opening_hours.json")
+
+    for query in ["margherita", "PIZZA  margherita", "zurek", "Żurek", "burger", "sushi"]:
+        assert mapped.find(query) == expected.find(query), query
+    for query in ["margerita", "burgr", "zurk", "sushi"]:
+        assert mapped.find_fuzzy(query) == expected.find_fuzzy(query), query
+    for text in ["pizza margherita with extra cheese", "burger please", "nothing"]:
+        assert mapped.resolve(text) == expected.resolve(text), text
+    assert mapped.find_by_id(12) == expected.find_by_id(12) == 2
+    assert mapped.find_by_id(99) is None
+    assert mapped.max_preparation_time([0, 1]) == 0.5
+
+
+def test_repository_menu_round_trip(tmp_path):
+    output_path = str(tmp_path / "snapshot.bin")
+    compile_snapshot(os.path.join(DATA_DIR, "opening_hours.json"), os.path.join(DATA_DIR, "menu.json"), output_path)
+    snapshot_file = SnapshotFile(output_path)
+    try:
+        expected = MenuCatalog(read_data("menu.json")["items"])
+        mapped = MappedMenuCatalog(snapshot_file)
+        assert [dict(item) for item in mapped.items] == expected.items
+        assert sorted(snapshot_file.keys()) == sorted(expected._alias_index.items())
+    finally:
+        snapshot_file.close()
+
+
+def test_rejects_files_that_are_not_snapshots(tmp_path):
+    path = tmp_path / "menu.json"
+    path.write_text(json.dumps({"items": MENU_ITEMS}))
+    with pytest.raises(ValueError):
+        SnapshotFile(str(path))